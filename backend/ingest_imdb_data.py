@@ -1,11 +1,11 @@
+import asyncio
 import os
 from pathlib import Path
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from langchain_openai import OpenAIEmbeddings
-from langchain_pinecone import PineconeVectorStore
-from pinecone import PodSpec
+from pinecone import Pinecone, PodSpec
 
 from src.config import (
     PINECONE_API_KEY,
@@ -13,13 +13,90 @@ from src.config import (
     EMBEDDING_MODEL,
     PINECONE_INDEX_NAME # Use the index name from config
 )
+from src.rag.embeddings import upsert_embeddings
 from src.utils.document_loader import MovieDocumentLoader
+from src.utils.fast_json import patch_pinecone_json
+from src.utils.rate_limit import throttled
+
+# Upserts go over the REST client here, so its request bodies use orjson
+patch_pinecone_json()
 
 console = Console()
 
-def ingest_imdb_data(file_path: Path):
+# Embedding tunables
+EMBEDDING_CHUNK_SIZE = 1000  # Texts per OpenAI embeddings request
+MAX_CONCURRENT_EMBEDDINGS = 8  # In-flight embedding requests (keeps us under RPM)
+INGEST_QUEUE_SIZE = 4  # Parsed batches buffered between the CSV reader and the embedders
+UPSERT_BATCH_SIZE = 100  # Vectors per Pinecone upsert request
+UPSERT_POOL_THREADS = 30  # Parallel upsert requests (network-bound, not CPU-bound)
+
+
+async def stream_ingest(
+    loader: MovieDocumentLoader,
+    embeddings: OpenAIEmbeddings,
+    index,
+    chunk_size: int = EMBEDDING_CHUNK_SIZE,
+    batch_size: int = UPSERT_BATCH_SIZE,
+    max_concurrency: int = MAX_CONCURRENT_EMBEDDINGS
+) -> int:
+    """
+    Producer-consumer ingest: CSV batches → embeddings → Pinecone.
+
+    A producer parses the CSV one chunk at a time into a bounded queue while
+    `max_concurrency` consumers embed and upsert batches as they arrive, so
+    memory holds at most a few batches instead of the whole dataset.
+
+    Returns:
+        Number of documents ingested
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=INGEST_QUEUE_SIZE)
+    batches = loader.iter_new_imdb_data(chunksize=chunk_size)
+
+    async def produce():
+        while True:
+            # CSV parsing is blocking - keep it off the event loop
+            batch = await asyncio.to_thread(next, batches, None)
+            if batch is None:
+                break
+            await queue.put(batch)
+
+        # One stop signal per consumer
+        for _ in range(max_concurrency):
+            await queue.put(None)
+
+    async def consume() -> int:
+        ingested = 0
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                return ingested
+
+            texts = [doc.page_content for doc in batch]
+            vectors = await throttled(lambda: embeddings.aembed_documents(texts))
+            await asyncio.to_thread(upsert_embeddings, index, batch, vectors, batch_size)
+            ingested += len(batch)
+
+    _, *ingested_counts = await asyncio.gather(
+        produce(),
+        *[consume() for _ in range(max_concurrency)]
+    )
+    return sum(ingested_counts)
+
+
+def ingest_imdb_data(
+    file_path: Path,
+    embedding_chunk_size: int = EMBEDDING_CHUNK_SIZE,
+    batch_size: int = UPSERT_BATCH_SIZE,
+    pool_threads: int = UPSERT_POOL_THREADS
+):
     """
     Loads IMBD.csv data, generates embeddings, and ingests into Pinecone.
+
+    Args:
+        file_path: Path to IMBD.csv
+        embedding_chunk_size: Texts per OpenAI embeddings request
+        batch_size: Vectors per Pinecone upsert request
+        pool_threads: Parallel Pinecone upsert requests
     """
     console.print(f"🚀 [bold green]Starting ingestion of IMBD.csv data from {file_path}...[/bold green]")
 
@@ -27,16 +104,11 @@ def ingest_imdb_data(file_path: Path):
     console.print("🔄 [yellow]Initializing OpenAI Embeddings...[/yellow]")
     embeddings = OpenAIEmbeddings(
         model=EMBEDDING_MODEL,
-        openai_api_key=OPENAI_API_KEY
+        openai_api_key=OPENAI_API_KEY,
+        chunk_size=embedding_chunk_size
     )
     console.print("✅ [green]Embeddings initialized.[/green]")
 
-    # Load data using the new loader
-    console.print(f"📚 [yellow]Loading documents from {file_path}...[/yellow]")
-    loader = MovieDocumentLoader(file_path)
-    documents = loader.load_new_imdb_data()
-    console.print(f"✅ [green]Loaded {len(documents)} documents.[/green]")
-
     # Initialize Pinecone Vector Store
     console.print("🌲 [yellow]Initializing Pinecone Vector Store...[/yellow]")
     if PINECONE_API_KEY is None:
@@ -44,25 +116,36 @@ def ingest_imdb_data(file_path: Path):
         console.print("Please set PINECONE_API_KEY and PINECONE_ENVIRONMENT in your .env file.")
         return
 
-    # Ensure index exists or create it
+    # Rows are streamed from the CSV, so nothing is loaded up front
+    loader = MovieDocumentLoader(file_path)
+
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         transient=True,
         console=console
     ) as progress:
-        task = progress.add_task("[yellow]Checking/Creating Pinecone index...", total=None)
-        
-        # This will create the index if it doesn't exist
-        # If using serverless, spec is not needed. If using pod, it might be.
-        # Assuming serverless for simplicity or handling in the PineconeVectorStore init
-        vector_store = PineconeVectorStore.from_documents(
-            documents,
-            index_name=PINECONE_INDEX_NAME,
-            embedding=embeddings
+        task = progress.add_task("[yellow]Streaming documents into Pinecone...", total=None)
+
+        # Upserts go straight to the index and fan out on its thread pool
+        index = Pinecone(api_key=PINECONE_API_KEY).Index(
+            PINECONE_INDEX_NAME,
+            pool_threads=pool_threads
+        )
+
+        # Embedding is network-bound: several batches are in flight at once
+        num_documents = asyncio.run(
+            stream_ingest(
+                loader,
+                embeddings,
+                index,
+                chunk_size=embedding_chunk_size,
+                batch_size=batch_size
+            )
         )
         progress.update(task, description="[green]Pinecone index ready.[/green]")
     
+    console.print(f"✅ [green]Ingested {num_documents} documents.[/green]")
     console.print(f"✅ [green]Data ingested into Pinecone index: {PINECONE_INDEX_NAME}[/green]")
     console.print("✨ [bold green]IMBD.csv data ingestion complete![/bold green]")
 
@@ -10,21 +10,58 @@ Endpoints:
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict
+import asyncio
+import json
+from contextlib import asynccontextmanager
+import logging
+from itertools import chain
 import sys
-from pathlib import Path
-
-# Add parent directory to path
-sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from src.rag.corrective_rag import CorrectiveRAG
+from src.rag.prompts import (
+    COMPARE_PREFER_RAG_TEMPLATE,
+    COMPARE_BALANCED_TEMPLATE,
+    COMPARE_PREFER_WEB_TEMPLATE,
+    EXTRACT_TITLES_TEMPLATE
+)
+from src.rag.sources import sources_to_dicts
+from src.utils.log_config import setup_logging
+from src.utils.rate_limit import throttled
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Initialize the RAG system at boot instead of on the first request.
+
+    The warm-up embeds and searches once through the same clients real
+    queries use (the pooled OpenAI client and the shared Pinecone gRPC
+    channel), so the first request skips the TCP/TLS handshakes. If anything
+    fails here (e.g. missing API keys) the app still starts and
+    get_rag_system() retries lazily; /health reports "degraded" until then.
+    """
+    try:
+        rag = get_rag_system()
+        vector = await asyncio.to_thread(rag._embed_query, "warmup")
+        await rag._asearch_by_vector_with_score(vector, k=1)
+    except Exception as e:
+        logger.warning("⚠️  RAG warm-up failed, will initialize on first request: %s", e)
+    yield
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Movie RAG API",
     description="Corrective RAG system for movie and TV show recommendations",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,  # orjson serializes responses much faster than stdlib json
+    lifespan=lifespan
 )
 
 # CORS middleware - allows frontend to call API
@@ -44,9 +81,9 @@ def get_rag_system():
     """Lazy load RAG system (expensive initialization)."""
     global rag_system
     if rag_system is None:
-        print("🔄 Initializing RAG system...")
+        logger.info("🔄 Initializing RAG system...")
         rag_system = CorrectiveRAG()
-        print("✅ RAG system ready!")
+        logger.info("✅ RAG system ready!")
     return rag_system
 
 
@@ -102,6 +139,7 @@ async def health_check():
     - status: Overall service health (healthy/degraded/unhealthy)
     - service: Service name and version
     - rag_initialized: Whether RAG system is loaded
+    - metrics: RAG counters (e.g. llm_score_skipped vs llm_score_called)
     - environment: Environment information
     - timestamp: Current server time
     """
@@ -130,6 +168,7 @@ async def health_check():
             "version": "1.0.0"
         },
         "rag_initialized": rag_healthy,
+        "metrics": dict(rag_system.metrics) if rag_healthy else {},
         "environment": {
             "openai_configured": has_openai_key,
             "pinecone_configured": has_pinecone_key,
@@ -156,7 +195,7 @@ async def search(request: SearchRequest):
         rag = get_rag_system()
 
         # Use enhanced RAG (no web fallback)
-        result = rag.query_enhanced(
+        result = await rag.aquery_enhanced(
             question=request.query,
             strategy=request.strategy,
             k=request.k
@@ -165,7 +204,7 @@ async def search(request: SearchRequest):
         return SearchResponse(
             question=result["question"],
             answer=result["answer"],
-            sources=result["sources"],
+            sources=sources_to_dicts(result["sources"]),
             metadata={
                 "strategy": result.get("strategy"),
                 "num_sources": result.get("num_sources")
@@ -195,7 +234,7 @@ async def search_corrective(request: SearchRequest):
         rag = get_rag_system()
 
         # Use corrective RAG (with web fallback)
-        result = rag.query_corrective(
+        result = await rag.aquery_corrective(
             question=request.query,
             strategy=request.strategy,
             k=request.k,
@@ -206,7 +245,7 @@ async def search_corrective(request: SearchRequest):
         return SearchResponse(
             question=result["question"],
             answer=result["answer"],
-            sources=result["sources"],
+            sources=sources_to_dicts(result["sources"]),
             metadata=result["metadata"]
         )
 
@@ -228,29 +267,22 @@ async def search_compare(request: CompareRequest):
         "k": 3
     }
     """
-    import asyncio
-    from concurrent.futures import ThreadPoolExecutor
-
     try:
         rag = get_rag_system()
 
-        # STEP 1: Run RAG + Web Search in PARALLEL (truly parallel)
-        executor = ThreadPoolExecutor(max_workers=2)
-
-        def run_rag():
-            return rag.query_enhanced(
-                question=request.query,
-                strategy="multi_query",  # Generate 3 query variations
-                k=request.k
-            )
+        # Suggestions only depend on the query - start them right away in a worker thread
+        suggestions_task = asyncio.create_task(
+            asyncio.to_thread(rag.get_movie_suggestions, request.query, num_suggestions=15)
+        )
 
-        def run_web():
-            web_docs = rag.web_search_fallback(request.query)
+        # STEP 1: Run RAG + Web Search in PARALLEL (both fully async, no worker threads)
+        async def run_web():
+            web_docs = await rag.aweb_search_fallback(request.query)
             if not web_docs:
                 return None, []
 
             web_context = rag.format_docs(web_docs)
-            web_answer = rag.generate_answer(request.query, web_context)
+            web_answer = await rag.agenerate_answer(request.query, web_context)
 
             web_sources = []
             for doc in web_docs[:5]:
@@ -261,17 +293,20 @@ async def search_compare(request: CompareRequest):
 
             return web_answer, web_sources
 
-        # Run both in parallel
-        loop = asyncio.get_event_loop()
-        rag_future = loop.run_in_executor(executor, run_rag)
-        web_future = loop.run_in_executor(executor, run_web)
-
         # Wait for both to complete
-        rag_result, (web_answer, web_sources) = await asyncio.gather(rag_future, web_future)
+        rag_result, (web_answer, web_sources) = await asyncio.gather(
+            rag.aquery_enhanced(
+                question=request.query,
+                strategy="multi_query",  # Generate 3 query variations
+                k=request.k
+            ),
+            run_web()
+        )
 
-        # STEP 2: Score RAG relevance (only 1 LLM call)
-        docs = [doc for doc in rag.retrieve(request.query, k=request.k)]
-        relevance_score, _ = rag.score_relevance(request.query, docs)
+        # STEP 2: Score RAG relevance (only 1 LLM call) on the docs the RAG pipeline already retrieved
+        relevance_score, _ = await asyncio.to_thread(
+            rag.score_relevance, request.query, rag_result["documents"]
+        )
 
         # STEP 3: Corrective RAG - Intelligent combination
         # HIGH score (>=8.5) = RAG is excellent, prefer RAG heavily
@@ -280,52 +315,42 @@ async def search_compare(request: CompareRequest):
 
         if web_answer:
             if relevance_score >= 8.5:
-                # RAG is excellent, give it strong preference
-                combined_prompt = f"""Give a SHORT conversational answer (2-3 sentences). Recommend ONE movie rated 6.5/10+. Don't list multiple movies.
-
-Database (HIGHLY RELEVANT - Prefer this): {rag_result['answer']}
-Web (Additional context): {web_answer}
-
-Short conversational answer (prefer database recommendation):"""
+                combined_template = COMPARE_PREFER_RAG_TEMPLATE
             elif relevance_score >= 7.0:
-                # Both are good, balanced combination
-                combined_prompt = f"""Give a SHORT conversational answer (2-3 sentences). Recommend ONE movie rated 6.5/10+. Don't list multiple movies.
-
-Database: {rag_result['answer']}
-Web: {web_answer}
-
-Short conversational answer (combine both sources):"""
+                combined_template = COMPARE_BALANCED_TEMPLATE
             else:
-                # RAG is weak, prefer web
-                combined_prompt = f"""Give a SHORT conversational answer (2-3 sentences). Recommend ONE movie rated 6.5/10+. Don't list multiple movies.
+                combined_template = COMPARE_PREFER_WEB_TEMPLATE
 
-Web (PRIMARY - Prefer this): {web_answer}
-Database (Additional context): {rag_result['answer']}
+            combined_prompt = combined_template.format(rag=rag_result['answer'], web=web_answer)
 
-Short conversational answer (prefer web recommendation):"""
+            # Use LLM to extract movie names from web content
+            extract_prompt = EXTRACT_TITLES_TEMPLATE.format(text=web_answer)
 
-            final_answer = rag.llm.invoke(combined_prompt).content
+            # The two calls have no data dependency - run them concurrently
+            combined_message, extracted_message = await asyncio.gather(
+                throttled(lambda: rag.llm.ainvoke(combined_prompt)),
+                throttled(lambda: rag.scorer_llm.ainvoke(extract_prompt))
+            )
+            final_answer = combined_message.content
+            extracted = extracted_message.content
         else:
             final_answer = rag_result["answer"]
 
         # STEP 4: Get suggestions - Ensure we always return 5 quality suggestions
-        rag_suggestions = rag.get_movie_suggestions(request.query, num_suggestions=15)
+        rag_suggestions = await suggestions_task
 
         # Extract actual movie names from web search content
         web_suggestions = []
         if web_answer:
-            # Use LLM to extract movie names from web content
-            extract_prompt = f"""Extract ONLY movie/show titles from this text. Return a simple list of titles, one per line. No explanations.
-
-Text: {web_answer}
+            try:
+                extracted_titles = json.loads(extracted).get("titles", [])
+            except (ValueError, AttributeError):
+                extracted_titles = []
 
-Movie titles (one per line):"""
-
-            extracted = rag.llm.invoke(extract_prompt).content
             web_movie_titles = [
-                line.strip().lstrip('-').lstrip('*').lstrip('•').strip()
-                for line in extracted.split('\n')
-                if line.strip() and len(line.strip()) > 3
+                title.strip()
+                for title in extracted_titles
+                if isinstance(title, str) and len(title.strip()) > 3
             ]
 
             # Create suggestions from extracted titles
@@ -339,34 +364,20 @@ Movie titles (one per line):"""
                         "year": "2024"
                     })
 
-        # Mix RAG + Web suggestions for best diversity (ensure 5 total)
-        mixed_suggestions = []
-        seen_titles_lower = set()
-
-        # Add top RAG results first (higher quality from our DB)
-        for sug in rag_suggestions:
-            if len(mixed_suggestions) >= 5:
+        # Mix RAG + Web suggestions for best diversity (ensure 5 total) in a single pass:
+        # top RAG picks first (higher quality from our DB), then web picks, then the rest
+        mixed = {}
+        for sug in chain(rag_suggestions[:3], web_suggestions[:2], rag_suggestions[3:], web_suggestions[2:]):
+            if len(mixed) >= 5:
                 break
-            title_lower = sug['title'].lower()
-            if title_lower not in seen_titles_lower:
-                mixed_suggestions.append(sug)
-                seen_titles_lower.add(title_lower)
-
-        # If we still don't have 5, add web suggestions
-        if len(mixed_suggestions) < 5:
-            for sug in web_suggestions:
-                if len(mixed_suggestions) >= 5:
-                    break
-                title_lower = sug['title'].lower()
-                if title_lower not in seen_titles_lower:
-                    mixed_suggestions.append(sug)
-                    seen_titles_lower.add(title_lower)
+            mixed.setdefault(sug['title'].casefold(), sug)
+        mixed_suggestions = list(mixed.values())
 
         return CompareResponse(
             query=request.query,
             rag_result={
                 "answer": rag_result["answer"],
-                "sources": rag_result["sources"][:3],
+                "sources": sources_to_dicts(rag_result["sources"][:3]),
                 "num_sources": len(rag_result["sources"])
             },
             web_result={
@@ -10,6 +10,9 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
+# Logging (pipeline step messages are DEBUG)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
 # Base paths
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
@@ -35,10 +38,28 @@ os.environ["LANGSMITH_PROJECT"] = LANGSMITH_PROJECT
 # Pinecone Configuration
 PINECONE_INDEX_NAME = "movie-rag-index"
 PINECONE_DIMENSION = 1536  # text-embedding-3-small dimension
+PINECONE_METRIC = "dotproduct"  # Vectors are L2-normalized before upsert, so dot product == cosine
 
 # OpenAI Configuration
 EMBEDDING_MODEL = "text-embedding-3-small"
 CHAT_MODEL = "gpt-4o-mini"  # GPT-4o-mini (fast and reliable)
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "20"))  # In-flight async OpenAI calls
+OPENAI_RATE_LIMIT_RETRIES = 5  # Retries on 429 before giving up
+SCORER_MAX_TOKENS = 128  # Output cap for JSON scoring/verification/extraction calls
+SPECULATIVE_VERIFY_MIN_CHARS = 800  # Streamed answer length before the one speculative verification starts
+SPECULATIVE_VERIFY_MAX_TAIL_CHARS = 200  # Text after the speculated prefix that still keeps its verdict
+ANSWER_PROMPT_CACHE_KEY = "movie-rag-answer"  # Routes answer calls to the same OpenAI prompt cache
+MIN_VERIFIABLE_ANSWER_CHARS = 30  # Shorter answers are reported ungrounded without an LLM check
+
+# Embedding / Upload
+EMBEDDING_BATCH_SIZE = int(os.getenv("RAG_EMBEDDING_OPENAI_BATCH_SIZE", "2048"))  # Texts per embeddings request (OpenAI max)
+EMBEDDING_MAX_RETRIES = 6  # Client retries on timeouts/5xx during bulk embedding
+EMBEDDING_BATCH_MAX_TOKENS = 250_000  # Estimated tokens per embeddings request (OpenAI max 300k)
+MAX_CONCURRENT_EMBEDDING_BATCHES = 5  # Embedding requests in flight during upload
+PINECONE_UPSERT_BATCH_SIZE = 100  # Vectors per Pinecone upsert request (2MB request limit)
+UPSERT_QUEUE_SIZE = 4  # Embedded batches buffered ahead of the Pinecone upserter
+UPLOAD_MARKER_NAMESPACE = "__upload_meta__"  # Holds the fingerprint of the uploaded CSVs (kept out of searches)
+EMBEDDING_CACHE_PATH = BASE_DIR / ".cache" / "embeddings.sqlite"  # Document vectors reused across ingest runs
 
 # Document Processing
 CHUNK_SIZE = 1000
@@ -47,8 +68,38 @@ CHUNK_OVERLAP = 200
 # Retrieval Settings
 TOP_K_RESULTS = 5
 RELEVANCE_THRESHOLD = 6.0  # Score must be >= 6/10 to skip web search (lower = more web search)
+# text-embedding-3-small puts on-topic query-doc cosines around 0.35-0.6, so only
+# near-verbatim matches clear the high cutoff. The low-side shortcut stays off
+# (None) until it is calibrated against logged similarities.
+SIMILARITY_HIGH_THRESHOLD = 0.65  # Mean top-3 cosine above this = relevant without asking the LLM
+SIMILARITY_LOW_THRESHOLD = None  # Mean top-3 cosine below this = irrelevant without asking the LLM
+RRF_K = 60  # Reciprocal rank fusion constant: score = sum(1 / (RRF_K + rank))
+WEB_SOURCE_PRIOR = 1.2  # Weight of a web result's relevance when merging with vector results
+VECTOR_SOURCE_PRIOR = 1.0  # Weight of a vector result's cosine similarity in the same merge
+NEAR_DUPLICATE_JACCARD = 0.85  # Word-shingle overlap above which two docs count as duplicates
 MIN_RATING_THRESHOLD = 6.5  # Minimum rating for quality suggestions
 
+# Web Search (Tavily)
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+SPECULATIVE_WEB_SEARCH = os.getenv("SPECULATIVE_WEB_SEARCH", "true").lower() == "true"  # Start web search before scoring finishes
+
+# Caching
+QUERY_EMBEDDING_CACHE_SIZE = 2048  # Distinct query strings whose embeddings are memoized
+FORMATTED_CONTEXT_CACHE_SIZE = 128  # Recently formatted document sets kept as context strings
+SEMANTIC_CACHE_THRESHOLD = 0.92  # Cosine similarity for rephrased questions to share LLM results
+SEMANTIC_CACHE_TTL_SECONDS = 7 * 24 * 3600  # 7 days
+SEMANTIC_CACHE_MAX_ENTRIES = 2000  # LRU capacity
+SEMANTIC_CACHE_LSH_TABLES = 16  # Random-projection hash tables probed per lookup
+SEMANTIC_CACHE_LSH_BITS = 8  # Hyperplanes per table (more bits = smaller buckets)
+QUERY_ENHANCEMENT_CACHE_SIZE = 4096  # HyDE/multi-query/expansion outputs memoized per query
+QUERY_ENHANCEMENT_LLM_CACHE_PATH = BASE_DIR / ".cache" / "query_enhancement.sqlite"  # Same outputs, kept across restarts
+RESPONSE_CACHE_THRESHOLD = 0.95  # Cosine similarity for a paraphrase to reuse a whole query response
+RESPONSE_CACHE_TTL_SECONDS = 300  # Whole responses are reused for 5 minutes
+QUERY_RESULT_CACHE_SIZE = 1024  # (query, k) similarity-search results kept in memory
+QUERY_RESULT_CACHE_TTL_SECONDS = 300  # Retrieval results are reused for 5 minutes
+QUERY_VECTOR_CACHE_THRESHOLD = 0.95  # Cosine similarity for a similar query to reuse Pinecone candidates
+QUERY_VECTOR_CACHE_MAX_ENTRIES = 10_000  # Query vectors (with their candidates) kept
+
 # Dataset paths
 NETFLIX_CSV = DATA_DIR / "NETFLIX MOVIES AND TV SHOWS CLUSTERING.csv"
 TV_SHOWS_CSV = DATA_DIR / "top_rated_2000webseries.csv"
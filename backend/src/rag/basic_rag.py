@@ -10,10 +10,15 @@ Flow:
 6. Return answer with sources
 """
 
-from typing import List, Dict
+import asyncio
+import logging
+import re
+from functools import cached_property, lru_cache
+from typing import Any, AsyncIterator, Awaitable, Callable, FrozenSet, List, Dict, Optional, Tuple
 from langchain_openai import OpenAIEmbeddings, ChatOpenAI
 from langchain_pinecone import PineconeVectorStore
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables import RunnablePassthrough
 
@@ -21,10 +26,49 @@ from src.config import (
     OPENAI_API_KEY,
     EMBEDDING_MODEL,
     CHAT_MODEL,
-    PINECONE_INDEX_NAME,
-    TOP_K_RESULTS
+    TOP_K_RESULTS,
+    QUERY_EMBEDDING_CACHE_SIZE,
+    FORMATTED_CONTEXT_CACHE_SIZE,
+    QUERY_RESULT_CACHE_TTL_SECONDS,
+    QUERY_VECTOR_CACHE_THRESHOLD,
+    QUERY_VECTOR_CACHE_MAX_ENTRIES,
+    ANSWER_PROMPT_CACHE_KEY
 )
 from src.rag.prompts import basic_rag_prompt, rag_with_sources_prompt
+from src.rag.semantic_cache import SemanticCache, make_guard
+from src.rag.vector_store import get_grpc_index
+from src.rag.sources import doc_to_source
+from src.utils.cache import BoundedCache
+from src.utils.query_cache import QueryCache
+from src.utils.http_client import get_http_client, get_async_http_client
+from src.utils.rate_limit import OPENAI_SEMAPHORE, throttled, with_backoff
+
+logger = logging.getLogger(__name__)
+
+
+# Per-document block of the context string (bound .format, built once)
+_format_doc_block = """Document {index}:
+Title: {title}
+Source: {source}
+Genre: {genre}
+Rating: {rating}
+Content: {content}""".format
+
+DOC_SEPARATOR = "\n\n---\n\n"
+
+@lru_cache(maxsize=256)
+def query_terms_pattern(terms: FrozenSet[str]) -> "re.Pattern":
+    """
+    Compile query terms into one alternation regex (cached per term set).
+
+    One alternation = one C-level scan per doc instead of one substring scan
+    per term; longest terms first, so "there" beats "the".
+    """
+    return re.compile('|'.join(map(re.escape, sorted(terms, key=len, reverse=True))))
+
+
+# Metadata fields rendered into the context (and therefore part of its cache key)
+_CONTEXT_FIELDS = ('title', 'source', 'genre', 'rating')
 
 
 class BasicRAG:
@@ -38,17 +82,46 @@ class BasicRAG:
     4. Returns answer with sources
     """
 
-    def __init__(self):
-        """Initialize RAG components."""
+    def __init__(self, embeddings: Optional[Embeddings] = None):
+        """
+        Initialize RAG components.
+
+        Args:
+            embeddings: Query embeddings model (defaults to OpenAIEmbeddings on
+                the shared HTTP pools)
+        """
         # Embeddings for query encoding
-        self.embeddings = OpenAIEmbeddings(
+        self.embeddings = embeddings or OpenAIEmbeddings(
             model=EMBEDDING_MODEL,
-            openai_api_key=OPENAI_API_KEY
+            openai_api_key=OPENAI_API_KEY,
+            http_client=get_http_client(),
+            http_async_client=get_async_http_client()
+        )
+
+        # Query embeddings by raw query string - shared by retrieval, multi-query
+        # batches and semantic cache lookups, so each query is embedded once
+        self._query_embedding_cache = BoundedCache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)
+
+        # Recently formatted contexts, keyed by document content
+        self._context_cache = BoundedCache(maxsize=FORMATTED_CONTEXT_CACHE_SIZE)
+
+        # Retrieval results for repeated (query, k) pairs
+        self._retrieval_cache = QueryCache()
+
+        # Pinecone candidates for semantically similar queries (query-vector cache):
+        # a near-identical question skips the vector store round trip
+        self._candidate_cache = SemanticCache(
+            threshold=QUERY_VECTOR_CACHE_THRESHOLD,
+            ttl_seconds=QUERY_RESULT_CACHE_TTL_SECONDS,
+            max_entries=QUERY_VECTOR_CACHE_MAX_ENTRIES
         )
 
-        # Vector store for retrieval
+        # LLM results shared by rephrased questions over the same context
+        self.semantic_cache = SemanticCache()
+
+        # Vector store for retrieval (sync queries go over the shared gRPC channel)
         self.vector_store = PineconeVectorStore(
-            index_name=PINECONE_INDEX_NAME,
+            index=get_grpc_index(),
             embedding=self.embeddings
         )
 
@@ -56,25 +129,154 @@ class BasicRAG:
         self.llm = ChatOpenAI(
             model=CHAT_MODEL,
             temperature=0,  # Deterministic answers
-            openai_api_key=OPENAI_API_KEY
+            openai_api_key=OPENAI_API_KEY,
+            http_client=get_http_client(),
+            http_async_client=get_async_http_client()
         )
 
-    def retrieve(self, query: str, k: int = TOP_K_RESULTS) -> List[Document]:
+    def _embed_query(self, query: str) -> List[float]:
+        """Embed a query, reusing the cached vector if this query was embedded before."""
+        return self._query_embedding_cache.get_or_set(
+            query, lambda: self.embeddings.embed_query(query)
+        )
+
+    def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        Embed several queries with at most one batched API call.
+
+        Cached queries are skipped; new vectors are added to the cache.
+        """
+        missing = [q for q in queries if self._query_embedding_cache.get(q) is None]
+        fresh = self._cache_query_embeddings(
+            missing, self.embeddings.embed_documents(missing) if missing else []
+        )
+        return [fresh.get(q) or self._query_embedding_cache.get(q) for q in queries]
+
+    async def _aembed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Async version of `_embed_queries`."""
+        missing = [q for q in queries if self._query_embedding_cache.get(q) is None]
+        new_vectors = []
+        if missing:
+            new_vectors = await throttled(lambda: self.embeddings.aembed_documents(missing))
+        fresh = self._cache_query_embeddings(missing, new_vectors)
+        return [fresh.get(q) or self._query_embedding_cache.get(q) for q in queries]
+
+    def _cache_query_embeddings(
+        self,
+        queries: List[str],
+        vectors: List[List[float]]
+    ) -> Dict[str, List[float]]:
+        """Store freshly embedded queries in the cache and return them as a dict."""
+        fresh = dict(zip(queries, vectors))
+        for query, vector in fresh.items():
+            self._query_embedding_cache.set(query, vector)
+        return fresh
+
+    def retrieve(
+        self,
+        query: str,
+        k: int = TOP_K_RESULTS,
+        precomputed_embedding: Optional[List[float]] = None
+    ) -> List[Document]:
         """
         Retrieve relevant documents for a query with actor-aware filtering.
 
         Args:
             query: User question
             k: Number of documents to retrieve
+            precomputed_embedding: Query vector if the caller already has it
 
         Returns:
             List of relevant Document objects
         """
+        cached = self._retrieval_cache.get(query, k)
+        if cached is not None:
+            return cached
+
         # Retrieve more documents initially for better filtering
         initial_k = k * 3
 
-        docs = self.vector_store.similarity_search(query, k=initial_k)
+        query_vector = precomputed_embedding or self._embed_query(query)
+        guard = make_guard("candidates", str(initial_k))
+        docs = self._candidate_cache.check(query_vector, guard)
+        if docs is None:
+            docs = self._with_scores(
+                self.vector_store.similarity_search_by_vector_with_score(query_vector, k=initial_k)
+            )
+            self._candidate_cache.store(query_vector, guard, docs)
+
+        docs = self._rerank_by_query_terms(query, docs, k)
+        self._retrieval_cache.put(query, k, docs)
+        return docs
+
+    async def aretrieve(
+        self,
+        query: str,
+        k: int = TOP_K_RESULTS,
+        precomputed_embedding: Optional[List[float]] = None
+    ) -> List[Document]:
+        """Async version of `retrieve` (shares the query embedding, result and candidate caches)."""
+        cached = self._retrieval_cache.get(query, k)
+        if cached is not None:
+            return cached
+
+        initial_k = k * 3
+
+        query_vector = precomputed_embedding or await asyncio.to_thread(self._embed_query, query)
+        guard = make_guard("candidates", str(initial_k))
+        docs = self._candidate_cache.check(query_vector, guard)
+        if docs is None:
+            docs = self._with_scores(
+                await self._asearch_by_vector_with_score(query_vector, k=initial_k)
+            )
+            self._candidate_cache.store(query_vector, guard, docs)
+
+        docs = self._rerank_by_query_terms(query, docs, k)
+        self._retrieval_cache.put(query, k, docs)
+        return docs
+
+    async def _asearch_by_vector_with_score(
+        self,
+        vector: List[float],
+        k: int
+    ) -> List[Tuple[Document, float]]:
+        """
+        Async similarity search over the shared gRPC index.
+
+        langchain_pinecone's async methods open (and close) a new IndexAsyncio
+        session per call, so async callers run the sync gRPC query in a
+        worker thread instead and reuse its open channel.
+        """
+        return await asyncio.to_thread(
+            self.vector_store.similarity_search_by_vector_with_score, vector, k=k
+        )
+
+    @staticmethod
+    def _with_scores(results: List[Tuple[Document, float]]) -> List[Document]:
+        """
+        Keep the retriever's cosine similarity on each document.
+
+        Stored as metadata["similarity_score"] so later stages (e.g. relevance
+        scoring) can use it without changing every retrieval signature.
+        """
+        docs = []
+        for doc, score in results:
+            doc.metadata["similarity_score"] = float(score)
+            docs.append(doc)
+        return docs
+
+    def _rerank_by_query_terms(self, query: str, docs: List[Document], k: int) -> List[Document]:
+        """
+        Actor-aware re-rank: prefer documents containing the query terms.
+
+        Args:
+            query: User question
+            docs: Candidate documents from the vector store
+            k: Number of documents to keep
 
+        Returns:
+            Top k documents
+        """
         # Check if query mentions specific actors
         query_lower = query.lower()
         actor_keywords = ['movie', 'film', 'show', 'starring', 'actor', 'with']
@@ -83,14 +285,14 @@ class BasicRAG:
         if any(keyword in query_lower for keyword in actor_keywords):
             # Extract potential actor names (simple heuristic)
             # Re-rank based on page_content containing query terms
-            query_terms = query_lower.split()
+            pattern = query_terms_pattern(frozenset(query_lower.split()))
 
             # Score documents by term matching in content
             scored_docs = []
             for doc in docs:
                 content_lower = doc.page_content.lower()
-                # Count how many query terms appear in content
-                score = sum(1 for term in query_terms if term in content_lower)
+                # Count how many distinct query terms appear in content
+                score = len(set(pattern.findall(content_lower)))
                 scored_docs.append((score, doc))
 
             # Sort by score (descending) and return top k
@@ -103,31 +305,36 @@ class BasicRAG:
         """
         Format retrieved documents into context string.
 
+        Results are cached on the rendered content (not object identity), so
+        the same documents coming back from a repeated retrieval reuse the
+        already formatted string.
+
         Args:
             docs: List of retrieved documents
 
         Returns:
             Formatted context string
         """
-        context_parts = []
-
-        for i, doc in enumerate(docs, 1):
-            title = doc.metadata.get('title', 'Unknown')
-            source = doc.metadata.get('source', 'Unknown')
-            genre = doc.metadata.get('genre', 'Unknown')
-            rating = doc.metadata.get('rating', 'Unknown')
-
-            context_part = f"""
-Document {i}:
-Title: {title}
-Source: {source}
-Genre: {genre}
-Rating: {rating}
-Content: {doc.page_content}
-"""
-            context_parts.append(context_part.strip())
-
-        return "\n\n---\n\n".join(context_parts)
+        key = tuple(
+            (doc.page_content, *(doc.metadata.get(field) for field in _CONTEXT_FIELDS))
+            for doc in docs
+        )
+        return self._context_cache.get_or_set(key, lambda: self._format_docs(docs))
+
+    @staticmethod
+    def _format_docs(docs: List[Document]) -> str:
+        """Render documents into the context string (uncached)."""
+        return DOC_SEPARATOR.join([
+            _format_doc_block(
+                index=i,
+                title=doc.metadata.get('title', 'Unknown'),
+                source=doc.metadata.get('source', 'Unknown'),
+                genre=doc.metadata.get('genre', 'Unknown'),
+                rating=doc.metadata.get('rating', 'Unknown'),
+                content=doc.page_content.rstrip()
+            )
+            for i, doc in enumerate(docs, 1)
+        ])
 
     def generate_answer(self, question: str, context: str) -> str:
         """
@@ -140,15 +347,109 @@ Content: {doc.page_content}
         Returns:
             Generated answer
         """
-        # Build chain: prompt → LLM → parse output
-        chain = (
-            {"context": lambda x: context, "question": lambda x: question}
-            | rag_with_sources_prompt
-            | self.llm
-            | StrOutputParser()
+        return self._semantic_cached(
+            question,
+            make_guard("answer", context),
+            lambda: self._answer_chain.invoke({"context": context, "question": question})
+        )
+
+    async def agenerate_answer(self, question: str, context: str) -> str:
+        """Async version of `generate_answer`."""
+        inputs = {"context": context, "question": question}
+        return await self._asemantic_cached(
+            question,
+            make_guard("answer", context),
+            lambda: throttled(lambda: self._answer_chain.ainvoke(inputs))
         )
 
-        return chain.invoke({})
+    async def astream_answer(self, question: str, context: str) -> AsyncIterator[str]:
+        """
+        Stream the answer as it is generated (same prompt as `generate_answer`).
+
+        Args:
+            question: User question
+            context: Retrieved context
+
+        Yields:
+            Answer text chunks
+        """
+        async def open_stream() -> Tuple[AsyncIterator[str], List[str]]:
+            # A 429 surfaces on the first chunk, so opening the stream means
+            # reading it; retries stop once a token has been yielded
+            stream = self._answer_chain.astream({"context": context, "question": question})
+            try:
+                return stream, [await stream.__anext__()]
+            except StopAsyncIteration:
+                return stream, []
+            except BaseException:
+                await stream.aclose()
+                raise
+
+        async with OPENAI_SEMAPHORE:
+            stream, first = await with_backoff(open_stream)
+            try:
+                for chunk in first:
+                    yield chunk
+                async for chunk in stream:
+                    yield chunk
+            finally:
+                await stream.aclose()
+
+    def _semantic_cached(self, question: str, guard: str, compute: Callable[[], Any]) -> Any:
+        """
+        Return the semantic cache hit for (question, guard), or compute and store it.
+
+        Args:
+            question: User question (embedded for the similarity lookup)
+            guard: Exact-match key from `make_guard`
+            compute: Zero-argument function running the LLM call
+
+        Returns:
+            Cached or freshly computed result
+        """
+        vector = self._embed_query(question)
+        cached = self.semantic_cache.check(vector, guard)
+        if cached is not None:
+            logger.debug("⚡ Semantic cache hit (%s)", guard.split(':')[0])
+            return cached
+
+        result = compute()
+        self.semantic_cache.store(vector, guard, result)
+        return result
+
+    async def _asemantic_cached(
+        self,
+        question: str,
+        guard: str,
+        compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Async version of `_semantic_cached` (`compute` returns an awaitable)."""
+        vector, cached = await self._asemantic_lookup(question, guard)
+        if cached is not None:
+            return cached
+
+        result = await compute()
+        self.semantic_cache.store(vector, guard, result)
+        return result
+
+    async def _asemantic_lookup(self, question: str, guard: str) -> Tuple[List[float], Optional[Any]]:
+        """Embed the question and check the semantic cache; returns (vector, cached or None)."""
+        vector = await asyncio.to_thread(self._embed_query, question)
+        cached = self.semantic_cache.check(vector, guard)
+        if cached is not None:
+            logger.debug("⚡ Semantic cache hit (%s)", guard.split(':')[0])
+        return vector, cached
+
+    @cached_property
+    def _answer_chain(self):
+        """
+        Chain: prompt → LLM → parse output (built once; invoked with context + question).
+
+        The static system message comes first and every call shares one
+        prompt_cache_key, so OpenAI's prompt cache can reuse its prefill.
+        """
+        llm = self.llm.bind(prompt_cache_key=ANSWER_PROMPT_CACHE_KEY)
+        return rag_with_sources_prompt | llm | StrOutputParser()
 
     def query(self, question: str, k: int = TOP_K_RESULTS) -> Dict:
         """
@@ -159,15 +460,15 @@ Content: {doc.page_content}
             k: Number of documents to retrieve
 
         Returns:
-            Dictionary with answer and sources
+            Dictionary with answer and sources (`Source` records)
         """
-        print(f"🔍 Retrieving relevant documents...")
+        logger.debug("🔍 Retrieving relevant documents...")
 
         # Step 1: Retrieve relevant documents
         docs = self.retrieve(question, k=k)
 
-        print(f"✅ Found {len(docs)} relevant documents")
-        print(f"🤖 Generating answer...")
+        logger.debug("✅ Found %s relevant documents", len(docs))
+        logger.debug("🤖 Generating answer...")
 
         # Step 2: Format context
         context = self.format_docs(docs)
@@ -179,20 +480,25 @@ Content: {doc.page_content}
         response = {
             "question": question,
             "answer": answer,
-            "sources": [
-                {
-                    "title": doc.metadata.get('title', 'Unknown'),
-                    "source": doc.metadata.get('source', 'Unknown'),
-                    "genre": doc.metadata.get('genre', 'Unknown'),
-                    "rating": doc.metadata.get('rating', 'Unknown')
-                }
-                for doc in docs
-            ],
+            "sources": [doc_to_source(doc) for doc in docs],
             "num_sources": len(docs)
         }
 
         return response
 
+    async def aquery(self, question: str, k: int = TOP_K_RESULTS) -> Dict:
+        """Async version of `query` (concurrent callers overlap their network waits)."""
+        docs = await self.aretrieve(question, k=k)
+        context = self.format_docs(docs)
+        answer = await self.agenerate_answer(question, context)
+
+        return {
+            "question": question,
+            "answer": answer,
+            "sources": [doc_to_source(doc) for doc in docs],
+            "num_sources": len(docs)
+        }
+
     def query_simple(self, question: str, k: int = TOP_K_RESULTS) -> str:
         """
         Simple query interface - returns just the answer.
@@ -8,16 +8,134 @@ Key Features:
 4. Adaptive Retrieval - Choose best source dynamically
 """
 
-from typing import List, Dict, Tuple
+from collections import Counter
+from dataclasses import dataclass
+from heapq import nlargest
+from functools import cached_property, lru_cache
+from statistics import fmean
+from typing import List, Dict, Optional, Set, Tuple
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
 import os
+import re
+
+import numpy as np
 from langchain_openai import ChatOpenAI
 from langchain_core.documents import Document
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.embeddings import Embeddings
 from langchain_core.output_parsers import StrOutputParser
-from tavily import TavilyClient
-
-from src.config import OPENAI_API_KEY, CHAT_MODEL, RELEVANCE_THRESHOLD, MIN_RATING_THRESHOLD
+from pydantic import BaseModel, ValidationError
+
+from src.config import (
+    OPENAI_API_KEY,
+    CHAT_MODEL,
+    RELEVANCE_THRESHOLD,
+    NEAR_DUPLICATE_JACCARD,
+    WEB_SOURCE_PRIOR,
+    VECTOR_SOURCE_PRIOR,
+    FORMATTED_CONTEXT_CACHE_SIZE,
+    SIMILARITY_HIGH_THRESHOLD,
+    SIMILARITY_LOW_THRESHOLD,
+    MIN_RATING_THRESHOLD,
+    SCORER_MAX_TOKENS,
+    SPECULATIVE_VERIFY_MIN_CHARS,
+    SPECULATIVE_VERIFY_MAX_TAIL_CHARS,
+    MIN_VERIFIABLE_ANSWER_CHARS,
+    TAVILY_SEARCH_URL,
+    SPECULATIVE_WEB_SEARCH
+)
+from src.rag.basic_rag import query_terms_pattern
 from src.rag.enhanced_rag import EnhancedRAG
+from src.rag.prompts import (
+    relevance_scoring_prompt,
+    answer_verification_prompt,
+    score_and_verify_prompt
+)
+from src.rag.semantic_cache import make_guard
+from src.rag.sources import Source, doc_to_source
+from src.utils.aio import run_sync
+from src.utils.cache import BoundedCache
+from src.utils.http_client import get_http_client, get_async_http_client
+from src.utils.rate_limit import throttled
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=4096)
+def _parse_rating(rating_str: str) -> float:
+    """Parse a rating ("7.5", "7.5/10", ...) to a float, 0.0 if unparseable."""
+    try:
+        return float(rating_str.split('/')[0])
+    except ValueError:
+        return 0.0
+
+
+# Fallback parsing for malformed/truncated verdicts (e.g. cut off at max_tokens):
+# the JSON field if present, else a bare 0-10 score such as "Score: 8" or "8/10"
+_SCORE_FIELD_RE = re.compile(r'"(?:score|relevance)"\s*:\s*"?(\d+(?:\.\d+)?)')
+_SCORE_RE = re.compile(r'(?<![\d.])(10(?:\.0+)?|\d(?:\.\d+)?)(?![\d.])')
+_GROUNDED_RE = re.compile(r'"grounded"\s*:\s*"?(true|false|yes|no)\b', re.I)
+
+
+def _shingles(text: str) -> Set[Tuple[str, ...]]:
+    """Word 3-gram set used for near-duplicate detection."""
+    words = text.lower().split()
+    if len(words) < 3:
+        return {tuple(words)}
+    return set(zip(words, words[1:], words[2:]))
+
+
+def _jaccard(a: Set, b: Set) -> float:
+    """Jaccard similarity of two sets."""
+    union = len(a | b)
+    return len(a & b) / union if union else 1.0
+
+
+# Canned refusals / "no information" answers - nothing to verify
+_TRIVIAL_ANSWER_RE = re.compile(r"^\s*(i (don'?t|do not) know|no (information|relevant))", re.I)
+
+
+# Per-document snippet in the relevance scoring prompt (bound .format, built once)
+_format_scoring_snippet = "Doc {index}: {snippet}...".format
+
+
+def _fallback_score(result: str) -> float:
+    """Best-effort 0-10 score from unparseable scorer output (5.0 if none found)."""
+    match = _SCORE_FIELD_RE.search(result) or _SCORE_RE.search(result)
+    return min(float(match.group(1)), 10.0) if match else 5.0
+
+
+def _fallback_grounded(result: str) -> bool:
+    """Best-effort groundedness from unparseable verifier output (False if none found)."""
+    match = _GROUNDED_RE.search(result)
+    return bool(match) and match.group(1).lower() in ("true", "yes")
+
+
+class ScoreAndVerifyResult(BaseModel):
+    """Fused relevance + groundedness verdict (one LLM call)."""
+    relevance: float
+    relevance_reason: str = "No explanation provided"
+    grounded: bool
+    grounded_reason: str = "No feedback"
+
+
+@dataclass(slots=True, frozen=True)
+class CorrectiveResult:
+    """`query_corrective` response as a flat record (attribute access, no nested dicts)."""
+    question: str
+    answer: str
+    sources: Tuple[Source, ...]
+    strategy: str
+    relevance_score: float
+    score_explanation: str
+    used_web_search: bool
+    used_feedback_loop: bool
+    is_grounded: bool
+    verification_feedback: str
+    num_sources: int
 
 
 class CorrectiveRAG(EnhancedRAG):
@@ -31,19 +149,30 @@ class CorrectiveRAG(EnhancedRAG):
     4. Provides confidence scores
     """
 
-    def __init__(self):
-        """Initialize Corrective RAG components."""
-        super().__init__()
+    def __init__(self, embeddings: Optional[Embeddings] = None):
+        """Initialize Corrective RAG components (see `BasicRAG.__init__`)."""
+        super().__init__(embeddings)
 
-        # Web search tool - Tavily (better for LLM applications)
-        tavily_key = os.getenv("TAVILY_API_KEY", "tvly-demo-key")  # Use demo key if not set
-        self.web_search = TavilyClient(api_key=tavily_key)
+        # Web search tool - Tavily (better for LLM applications), called over the
+        # shared keep-alive HTTP pools instead of a new connection per search
+        self.tavily_api_key = os.getenv("TAVILY_API_KEY", "tvly-demo-key")  # Use demo key if not set
 
-        # LLM for scoring and reflection
+        # Counters for monitoring (e.g. how often LLM scoring is skipped)
+        self.metrics = Counter()
+
+        # Scoring snippets for recently scored document sets
+        self._scoring_text_cache = BoundedCache(maxsize=FORMATTED_CONTEXT_CACHE_SIZE)
+
+        # LLM for scoring and reflection - JSON mode with a small output cap,
+        # since decoding time grows with output tokens and we only need a verdict
         self.scorer_llm = ChatOpenAI(
             model=CHAT_MODEL,
             temperature=0,  # Deterministic for scoring
-            openai_api_key=OPENAI_API_KEY
+            openai_api_key=OPENAI_API_KEY,
+            max_tokens=SCORER_MAX_TOKENS,
+            model_kwargs={"response_format": {"type": "json_object"}},
+            http_client=get_http_client(),
+            http_async_client=get_async_http_client()
         )
 
     def score_relevance(self, query: str, documents: List[Document]) -> Tuple[float, str]:
@@ -62,52 +191,93 @@ class CorrectiveRAG(EnhancedRAG):
         - 0 = Completely irrelevant
         - 10 = Perfectly relevant
         - Threshold: 7 (configurable)
+        - Skipped when the retriever's cosine similarity is clearly high or low
         """
-        # Format documents for scoring
-        docs_text = "\n\n".join([
-            f"Doc {i+1}: {doc.page_content[:200]}..."
-            for i, doc in enumerate(documents[:3])  # Score top 3
-        ])
-
-        scoring_prompt = ChatPromptTemplate.from_template(
-            """You are an expert relevance scorer for a movie/TV recommendation system with advanced semantic understanding.
+        shortcut = self._similarity_shortcut(documents)
+        if shortcut:
+            return shortcut
+
+        self.metrics["llm_score_called"] += 1
+        docs_text = self._scoring_docs_text(documents)
+        return self._semantic_cached(
+            query,
+            make_guard("score", docs_text),
+            lambda: self._parse_score(
+                self._scoring_chain.invoke({"query": query, "documents": docs_text})
+            )
+        )
 
-Your task: Rate how well these documents can answer the user's question with HIGH PRECISION.
+    async def ascore_relevance(self, query: str, documents: List[Document]) -> Tuple[float, str]:
+        """Async version of `score_relevance`."""
+        shortcut = self._similarity_shortcut(documents)
+        if shortcut:
+            return shortcut
 
-CRITICAL SCORING CRITERIA:
-- **Actor/Cast Matching**: If user asks for specific actors, documents MUST contain those exact actors in Cast/Stars fields
-- **Semantic Relevance**: Documents must match the core intent (genre, theme, mood, specific attributes)
-- **Information Completeness**: Documents must have enough detail to answer comprehensively
-- **Quality**: Higher-rated content is more valuable for recommendations
+        self.metrics["llm_score_called"] += 1
+        chain = self._scoring_chain
+        docs_text = self._scoring_docs_text(documents)
 
-Scoring Guide (BE STRICT):
-- 0-3: Completely irrelevant, wrong topic, or missing critical filter (e.g., wrong actor)
-- 4-6: Somewhat related but missing key information or only partial match
-- 7-8: Relevant and can answer the question adequately
-- 9-10: Highly relevant, perfect match for all criteria, contains complete information
+        async def compute():
+            result = await throttled(lambda: chain.ainvoke({"query": query, "documents": docs_text}))
+            return self._parse_score(result)
 
-User Question: {query}
+        return await self._asemantic_cached(query, make_guard("score", docs_text), compute)
 
-Retrieved Documents:
-{documents}
+    def _similarity_shortcut(self, documents: List[Document]) -> Optional[Tuple[float, str]]:
+        """
+        Score from the retriever's cosine similarity when it is conclusive.
 
-Instructions:
-1. First line: Give ONLY a number (0-10)
-2. Second line: One sentence explaining your score
+        Args:
+            documents: Retrieved documents (with metadata["similarity_score"])
 
-Your Score:"""
+        Returns:
+            (score, explanation) if the mean top-3 similarity is clearly high or
+            low, None if the LLM has to decide
+        """
+        scores = [
+            doc.metadata["similarity_score"]
+            for doc in documents[:3]
+            if "similarity_score" in doc.metadata
+        ]
+        if not scores:
+            return None
+
+        mean_sim = fmean(scores)
+        logger.debug("   Mean top-3 similarity: %.3f", mean_sim)
+        if mean_sim > SIMILARITY_HIGH_THRESHOLD:
+            self.metrics["llm_score_skipped"] += 1
+            return 9.0, f"High cosine similarity short-circuit (mean {mean_sim:.2f})"
+        if SIMILARITY_LOW_THRESHOLD is not None and mean_sim < SIMILARITY_LOW_THRESHOLD:
+            self.metrics["llm_score_skipped"] += 1
+            return 2.0, f"Low cosine similarity short-circuit (mean {mean_sim:.2f})"
+
+        return None
+
+    def _scoring_docs_text(self, documents: List[Document]) -> str:
+        """Format the top documents for scoring (cached per document contents)."""
+        top_docs = documents[:3]  # Score top 3
+        return self._scoring_text_cache.get_or_set(
+            tuple(doc.page_content for doc in top_docs),
+            lambda: "\n\n".join([
+                _format_scoring_snippet(index=i, snippet=doc.page_content[:200])
+                for i, doc in enumerate(top_docs, 1)
+            ])
         )
 
-        chain = scoring_prompt | self.scorer_llm | StrOutputParser()
-        result = chain.invoke({"query": query, "documents": docs_text})
+    @cached_property
+    def _scoring_chain(self):
+        """Relevance scoring chain (built once)."""
+        return relevance_scoring_prompt | self.scorer_llm | StrOutputParser()
 
-        # Parse score and explanation
-        lines = result.strip().split('\n')
+    @staticmethod
+    def _parse_score(result: str) -> Tuple[float, str]:
+        """Parse the scorer's JSON verdict into (score, explanation)."""
         try:
-            score = float(lines[0].strip())
-            explanation = lines[1] if len(lines) > 1 else "No explanation provided"
-        except:
-            score = 5.0  # Default if parsing fails
+            parsed = json.loads(result)
+            score = float(parsed["score"])
+            explanation = parsed.get("explanation") or "No explanation provided"
+        except (ValueError, KeyError, TypeError, AttributeError):
+            score = _fallback_score(result)  # 5.0 if no score can be recovered
             explanation = result
 
         return score, explanation
@@ -127,37 +297,65 @@ Your Score:"""
         - Questions about other content need external data
         - DuckDuckGo provides fresh, relevant info
         """
-        print("🌐 Performing web search (Tavily)...")
+        logger.debug("🌐 Performing web search (Tavily)...")
 
         try:
             # Search with Tavily (better quality for LLM apps)
-            response = self.web_search.search(
-                query=query,
-                max_results=5,
-                search_depth="basic"
-            )
+            response = get_http_client().post(TAVILY_SEARCH_URL, json=self._tavily_payload(query))
+            response.raise_for_status()
 
-            # Convert to Document format
-            web_docs = []
-            for result in response.get('results', []):
-                doc = Document(
-                    page_content=result.get('content', ''),
-                    metadata={
-                        "source": "web_search",
-                        "title": result.get('title', 'Web Result'),
-                        "url": result.get('url', ''),
-                        "search_engine": "Tavily"
-                    }
-                )
-                web_docs.append(doc)
+            return self._web_results_to_docs(response.json())
+
+        except Exception as e:
+            logger.warning("⚠️  Web search failed: %s", e)
+            logger.warning("💡 Get free Tavily API key at https://tavily.com")
+            return []
 
-            return web_docs
+    async def aweb_search_fallback(self, query: str) -> List[Document]:
+        """Async version of `web_search_fallback` (non-blocking, pooled connection)."""
+        logger.debug("🌐 Performing web search (Tavily)...")
+
+        try:
+            response = await get_async_http_client().post(
+                TAVILY_SEARCH_URL, json=self._tavily_payload(query)
+            )
+            response.raise_for_status()
+
+            return self._web_results_to_docs(response.json())
 
         except Exception as e:
-            print(f"⚠️  Web search failed: {e}")
-            print("💡 Get free Tavily API key at https://tavily.com")
+            logger.warning("⚠️  Web search failed: %s", e)
+            logger.warning("💡 Get free Tavily API key at https://tavily.com")
             return []
 
+    def _tavily_payload(self, query: str) -> Dict:
+        """Request body for Tavily's /search endpoint."""
+        return {
+            "api_key": self.tavily_api_key,
+            "query": query,
+            "max_results": 5,
+            "search_depth": "basic"
+        }
+
+    @staticmethod
+    def _web_results_to_docs(response: Dict) -> List[Document]:
+        """Convert a Tavily search response to Document format."""
+        web_docs = []
+        for result in response.get('results', []):
+            doc = Document(
+                page_content=result.get('content', ''),
+                metadata={
+                    "source": "web_search",
+                    "title": result.get('title', 'Web Result'),
+                    "url": result.get('url', ''),
+                    "search_engine": "Tavily",
+                    "web_score": float(result.get('score') or 0.0)  # Tavily relevance, 0-1
+                }
+            )
+            web_docs.append(doc)
+
+        return web_docs
+
     def verify_answer(self, question: str, answer: str, context: str) -> Tuple[bool, str]:
         """
         Verify that the answer is grounded in the provided context.
@@ -175,40 +373,174 @@ Your Score:"""
         Returns:
             Tuple of (is_grounded: bool, feedback: str)
         """
-        verification_prompt = ChatPromptTemplate.from_template(
-            """You are a fact-checker for a Q&A system.
+        trivial = self._trivial_answer_verdict(answer)
+        if trivial:
+            return trivial
+
+        inputs = {"question": question, "answer": answer, "context": context}
+        return self._semantic_cached(
+            question,
+            make_guard("verify", answer, context),
+            lambda: self._parse_verification(self._verification_chain.invoke(inputs))
+        )
+
+    async def averify_answer(self, question: str, answer: str, context: str) -> Tuple[bool, str]:
+        """Async version of `verify_answer`."""
+        trivial = self._trivial_answer_verdict(answer)
+        if trivial:
+            return trivial
+
+        chain = self._verification_chain
+        inputs = {"question": question, "answer": answer, "context": context}
+
+        async def compute():
+            result = await throttled(lambda: chain.ainvoke(inputs))
+            return self._parse_verification(result)
+
+        return await self._asemantic_cached(question, make_guard("verify", answer, context), compute)
+
+    def _trivial_answer_verdict(self, answer: str) -> Optional[Tuple[bool, str]]:
+        """
+        Skip LLM verification for empty, very short or refusal answers.
+
+        Returns:
+            (False, reason) for a trivial answer, None if it needs verifying
+        """
+        if len(answer.strip()) < MIN_VERIFIABLE_ANSWER_CHARS or _TRIVIAL_ANSWER_RE.match(answer[:120]):
+            self.metrics["llm_verify_skipped"] += 1
+            return False, "Trivial/refusal answer - skipped LLM verification"
+        return None
+
+    @cached_property
+    def _verification_chain(self):
+        """Groundedness verification chain (built once)."""
+        return answer_verification_prompt | self.scorer_llm | StrOutputParser()
+
+    @staticmethod
+    def _parse_verification(result: str) -> Tuple[bool, str]:
+        """Parse the verifier's JSON verdict into (is_grounded, feedback)."""
+        try:
+            parsed = json.loads(result)
+            is_grounded = str(parsed["grounded"]).lower() in ("true", "yes")
+            feedback = parsed.get("feedback") or "No feedback"
+        except (ValueError, KeyError, TypeError, AttributeError):
+            is_grounded = _fallback_grounded(result)
+            feedback = result
+
+        return is_grounded, feedback
+
+    async def agenerate_verified_answer(self, question: str, context: str) -> Tuple[str, bool, str]:
+        """
+        Generate an answer and verify it, overlapping the two.
+
+        The answer is streamed; at the first paragraph break once it is long
+        enough, verification of the text so far starts speculatively (once
+        per answer). If only a short tail follows, that verdict is kept;
+        otherwise it is discarded and the full answer is verified.
+
+        Args:
+            question: User question
+            context: Retrieved context
+
+        Returns:
+            Tuple of (answer, is_grounded, feedback)
+        """
+        guard = make_guard("answer", context)
+        vector, answer = await self._asemantic_lookup(question, guard)
+        if answer is not None:
+            return (answer, *await self.averify_answer(question, answer, context))
+
+        parts = []
+        length = 0
+        speculative_text, speculative_task = None, None
+        try:
+            async for chunk in self.astream_answer(question, context):
+                parts.append(chunk)
+                length += len(chunk)
+                if not speculative_task and "\n\n" in chunk and length >= SPECULATIVE_VERIFY_MIN_CHARS:
+                    speculative_text = "".join(parts)
+                    speculative_task = asyncio.create_task(
+                        self.averify_answer(question, speculative_text, context)
+                    )
+
+            answer = "".join(parts)
+            self.semantic_cache.store(vector, guard, answer)
+
+            tail = answer[len(speculative_text or ""):].strip()
+            if speculative_task and len(tail) <= SPECULATIVE_VERIFY_MAX_TAIL_CHARS:
+                is_grounded, feedback = await speculative_task
+            else:
+                await self._discard(speculative_task)
+                is_grounded, feedback = await self.averify_answer(question, answer, context)
+        except BaseException:
+            await self._discard(speculative_task)
+            raise
 
-Verify if the answer is fully grounded in the provided context.
+        return answer, is_grounded, feedback
 
-Rules:
-1. Answer should ONLY use information from context
-2. Flag any facts not present in context
-3. Check if citations are accurate
+    def score_and_verify(
+        self,
+        question: str,
+        answer: str,
+        context: str
+    ) -> Tuple[float, str, bool, str]:
+        """
+        Score relevance AND verify the answer in a single LLM call.
 
-Question: {question}
+        Both checks reason over the same (question, context) pair, so one
+        prompt replaces two round-trips once an answer exists.
 
-Context:
-{context}
+        Args:
+            question: User question
+            answer: Generated answer
+            context: Source documents the answer was generated from
 
-Generated Answer:
-{answer}
+        Returns:
+            Tuple of (relevance 0-10, relevance_reason, is_grounded, grounded_reason)
+        """
+        self.metrics["llm_score_called"] += 1
+        inputs = {"question": question, "answer": answer, "context": context}
+        return self._semantic_cached(
+            question,
+            make_guard("score_verify", answer, context),
+            lambda: self._parse_score_and_verify(self._score_and_verify_chain.invoke(inputs))
+        )
 
-Is the answer grounded? (YES/NO):
-Feedback (one sentence):"""
+    async def ascore_and_verify(
+        self,
+        question: str,
+        answer: str,
+        context: str
+    ) -> Tuple[float, str, bool, str]:
+        """Async version of `score_and_verify`."""
+        self.metrics["llm_score_called"] += 1
+        chain = self._score_and_verify_chain
+        inputs = {"question": question, "answer": answer, "context": context}
+
+        async def compute():
+            result = await throttled(lambda: chain.ainvoke(inputs))
+            return self._parse_score_and_verify(result)
+
+        return await self._asemantic_cached(
+            question, make_guard("score_verify", answer, context), compute
         )
 
-        chain = verification_prompt | self.scorer_llm | StrOutputParser()
-        result = chain.invoke({
-            "question": question,
-            "answer": answer,
-            "context": context
-        })
+    @cached_property
+    def _score_and_verify_chain(self):
+        """Fused scoring + verification chain (built once)."""
+        # Two verdicts - allow twice the usual scorer output budget
+        llm = self.scorer_llm.bind(max_tokens=2 * SCORER_MAX_TOKENS)
+        return score_and_verify_prompt | llm | StrOutputParser()
 
-        lines = result.strip().split('\n')
-        is_grounded = "yes" in lines[0].lower()
-        feedback = lines[1] if len(lines) > 1 else "No feedback"
+    @staticmethod
+    def _parse_score_and_verify(result: str) -> Tuple[float, str, bool, str]:
+        """Parse the fused JSON verdict."""
+        try:
+            parsed = ScoreAndVerifyResult.model_validate_json(result)
+        except ValidationError:
+            return _fallback_score(result), result, _fallback_grounded(result), result
 
-        return is_grounded, feedback
+        return parsed.relevance, parsed.relevance_reason, parsed.grounded, parsed.grounded_reason
 
     def refine_with_feedback(
         self,
@@ -227,28 +559,150 @@ Feedback (one sentence):"""
         Returns:
             Tuple of (refined_docs, refined_answer)
         """
-        # Check if answer seems incomplete or low quality
-        answer_lower = initial_answer.lower()
-        quality_issues = [
-            len(initial_answer) < 50,  # Too short
-            "i don't" in answer_lower or "cannot" in answer_lower,  # Uncertain
-            "no information" in answer_lower,  # Missing info
-        ]
+        return run_sync(self.arefine_with_feedback(question, initial_docs, initial_answer))
 
-        if any(quality_issues):
-            print("🔄 Feedback loop: Refining results due to low initial quality...")
+    async def arefine_with_feedback(
+        self,
+        question: str,
+        initial_docs: List[Document],
+        initial_answer: str
+    ) -> Tuple[List[Document], str]:
+        """
+        Async version of `refine_with_feedback`.
 
-            # Try different retrieval strategy
-            refined_docs = self.retrieve_with_multi_query(question, k=10)
+        Re-retrieves with HyDE, multi-query and expansion concurrently and
+        fuses the three rankings with reciprocal rank fusion.
+        """
+        if self._needs_refinement(initial_answer):
+            logger.debug("🔄 Feedback loop: Refining results due to low initial quality...")
+
+            # Try all enhanced retrieval strategies at once
+            strategy_results = await asyncio.gather(
+                self.aretrieve_with_hyde(question, k=10),
+                self.aretrieve_with_multi_query(question, k=10),
+                self.aretrieve_with_expansion(question, k=10)
+            )
+            refined_docs = self._dedup_docs(self._reciprocal_rank_fusion(strategy_results, k=10))
 
             # Re-generate answer
-            context = self.format_docs(refined_docs)
-            refined_answer = self.generate_answer(question, context)
+            refined_answer = await self.agenerate_answer(question, self.format_docs(refined_docs))
 
             return refined_docs, refined_answer
 
         return initial_docs, initial_answer
 
+    @staticmethod
+    def _dedup_docs(docs: List[Document]) -> List[Document]:
+        """
+        Drop duplicate and near-duplicate documents, keeping first occurrences.
+
+        Exact duplicates are caught by a hash of the leading content, near
+        duplicates by word-shingle Jaccard similarity above NEAR_DUPLICATE_JACCARD.
+        Shorter context = fewer prompt tokens for scoring, generation and verification.
+
+        Args:
+            docs: Documents in priority order
+
+        Returns:
+            Deduplicated documents (same order)
+        """
+        kept = []
+        seen_hashes = set()
+        kept_shingles = []
+
+        for doc in docs:
+            digest = hashlib.blake2b(doc.page_content[:512].encode("utf-8"), digest_size=8).digest()
+            if digest in seen_hashes:
+                continue
+
+            shingles = _shingles(doc.page_content)
+            if any(_jaccard(shingles, other) > NEAR_DUPLICATE_JACCARD for other in kept_shingles):
+                continue
+
+            seen_hashes.add(digest)
+            kept_shingles.append(shingles)
+            kept.append(doc)
+
+        return kept
+
+    @classmethod
+    def _merge_topk(
+        cls,
+        web_docs: List[Document],
+        vector_docs: List[Document],
+        k: int
+    ) -> List[Document]:
+        """
+        Merge web and vector results into a bounded top-k context.
+
+        Each doc is scored as source prior * relevance (Tavily score for web
+        results, cosine similarity for vector results), so the prompt never
+        grows past k documents however many results the fallback adds.
+
+        Args:
+            web_docs: Web search results
+            vector_docs: Vector DB results
+            k: Number of documents to keep
+
+        Returns:
+            Top-k deduplicated documents, best first (ties keep web results first)
+        """
+        def merge_score(doc: Document) -> float:
+            if doc.metadata.get("source") == "web_search":
+                return WEB_SOURCE_PRIOR * doc.metadata.get("web_score", 0.0)
+            return VECTOR_SOURCE_PRIOR * doc.metadata.get("similarity_score", 0.0)
+
+        return nlargest(k, cls._dedup_docs(web_docs + vector_docs), key=merge_score)
+
+    @staticmethod
+    def _needs_refinement(answer: str) -> bool:
+        """Check if an answer seems incomplete or low quality."""
+        answer_lower = answer.lower()
+        quality_issues = [
+            len(answer) < 50,  # Too short
+            "i don't" in answer_lower or "cannot" in answer_lower,  # Uncertain
+            "no information" in answer_lower,  # Missing info
+        ]
+        return any(quality_issues)
+
+    @staticmethod
+    def to_result(response: Dict) -> CorrectiveResult:
+        """
+        Flatten a `query_corrective` response dict into a `CorrectiveResult`.
+
+        Args:
+            response: Dict returned by `query_corrective` / `aquery_corrective`
+
+        Returns:
+            CorrectiveResult with the metadata fields lifted to the top level
+        """
+        metadata = response["metadata"]
+        return CorrectiveResult(
+            question=response["question"],
+            answer=response["answer"],
+            sources=tuple(response["sources"]),
+            strategy=metadata["strategy"],
+            relevance_score=metadata["relevance_score"],
+            score_explanation=metadata["score_explanation"],
+            used_web_search=metadata["used_web_search"],
+            used_feedback_loop=metadata["used_feedback_loop"],
+            is_grounded=metadata["is_grounded"],
+            verification_feedback=metadata["verification_feedback"],
+            num_sources=metadata["num_sources"]
+        )
+
+    @staticmethod
+    async def _discard(task: Optional[asyncio.Task]) -> None:
+        """Cancel a speculative task and wait for it, so its outcome is always retrieved."""
+        if task is None:
+            return
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            try:
+                await task
+            except Exception as e:
+                logger.debug("Discarded speculative task failed: %s", e)
+
     def query_corrective(
         self,
         question: str,
@@ -278,91 +732,172 @@ Feedback (one sentence):"""
 
         Returns:
             Dict with answer, sources, scores, and metadata
+
+        Sync wrapper around `aquery_corrective`; async callers should await that directly.
+        """
+        return run_sync(self.aquery_corrective(
+            question,
+            strategy=strategy,
+            k=k,
+            enable_web_fallback=enable_web_fallback,
+            enable_verification=enable_verification,
+            enable_feedback_loop=enable_feedback_loop
+        ))
+
+    async def aquery_corrective(
+        self,
+        question: str,
+        strategy: str = "multi_query",
+        k: int = 5,
+        enable_web_fallback: bool = True,
+        enable_verification: bool = True,
+        enable_feedback_loop: bool = True
+    ) -> Dict:
+        """
+        Async Corrective RAG pipeline (see `query_corrective`).
+
+        Relevance scoring and answer generation on the vector DB docs run
+        concurrently; the speculative answer is discarded if the web
+        fallback replaces the context.
         """
-        print(f"\n{'='*80}")
-        print(f"🔧 CORRECTIVE RAG PIPELINE")
-        print(f"{'='*80}\n")
+        logger.debug("🔧 CORRECTIVE RAG PIPELINE")
 
         # Step 1: Retrieve from vector DB
-        print(f"📊 Step 1: Retrieving from vector database...")
+        logger.debug("📊 Step 1: Retrieving from vector database...")
         if strategy == "basic":
-            docs = self.retrieve(question, k=k)
+            docs = await self.aretrieve(question, k=k)
         else:
             # Use enhanced retrieval
             if strategy == "hyde":
-                docs = self.retrieve_with_hyde(question, k=k)
+                docs = await self.aretrieve_with_hyde(question, k=k)
             elif strategy == "multi_query":
-                docs = self.retrieve_with_multi_query(question, k=k)
+                docs = await self.aretrieve_with_multi_query(question, k=k)
             else:
-                docs = self.retrieve_with_expansion(question, k=k)
+                docs = await self.aretrieve_with_expansion(question, k=k)
+        docs = self._dedup_docs(docs)
 
-        # Step 2: Score relevance
-        print(f"\n⭐ Step 2: Scoring relevance...")
-        relevance_score, score_explanation = self.score_relevance(question, docs)
-        print(f"   Score: {relevance_score}/10")
-        print(f"   Reason: {score_explanation}")
+        context = self.format_docs(docs)
+        shortcut = self._similarity_shortcut(docs)
+        # Similarity alone says the vector DB docs are good enough: no fallback will follow
+        confident = shortcut is not None and shortcut[0] >= RELEVANCE_THRESHOLD and len(docs) >= 2
+        # ...or says they aren't: the web fallback will replace the context
+        fallback_certain = enable_web_fallback and shortcut is not None and not confident
+
+        # Speculatively start the web search now so its latency overlaps scoring,
+        # unless similarity already rules the fallback out (saves a Tavily call);
+        # cancelled below if the vector DB results turn out good enough
+        web_task = None
+        if enable_web_fallback and SPECULATIVE_WEB_SEARCH and not confident:
+            web_task = asyncio.create_task(self.aweb_search_fallback(question))
+
+        # Step 2: Score relevance - while a speculative answer is generated from the same docs.
+        # If the answer is already in the semantic cache, one fused call scores the docs
+        # and verifies it instead; scoring never waits on generation.
+        # If similarity already settles the score and no fallback will follow,
+        # verification instead overlaps the tail of a streamed answer.
+        logger.debug("⭐ Step 2: Scoring relevance...")
+        stream_verify = enable_verification and confident
+        cached_answer = None
+        if enable_verification and not shortcut:
+            _, cached_answer = await self._asemantic_lookup(question, make_guard("answer", context))
+        # No speculative answer when the fallback is certain - it would be thrown away
+        answer_task = None
+        if not fallback_certain and cached_answer is None:
+            answer_task = asyncio.create_task(
+                self.agenerate_verified_answer(question, context) if stream_verify
+                else self.agenerate_answer(question, context)
+            )
+        verification = None
+        try:
+            if shortcut:
+                relevance_score, score_explanation = shortcut
+            elif cached_answer is not None:
+                relevance_score, score_explanation, *verification = await self.ascore_and_verify(
+                    question, cached_answer, context
+                )
+            else:
+                relevance_score, score_explanation = await self.ascore_relevance(question, docs)
+        except BaseException:
+            await self._discard(answer_task)
+            await self._discard(web_task)
+            raise
+        logger.debug("   Score: %s/10", relevance_score)
+        logger.debug("   Reason: %s", score_explanation)
 
         used_web_search = False
 
         # Step 3: Web search fallback if needed
         if enable_web_fallback and (relevance_score < RELEVANCE_THRESHOLD or len(docs) < 2):
-            print(f"\n⚠️  Relevance score ({relevance_score}) < threshold ({RELEVANCE_THRESHOLD}) or low doc count ({len(docs)})")
-            print(f"🌐 Step 3: Triggering web search fallback...")
+            logger.info(
+                "⚠️  Relevance score (%s) < threshold (%s) or low doc count (%s)",
+                relevance_score, RELEVANCE_THRESHOLD, len(docs)
+            )
+            logger.debug("🌐 Step 3: Triggering web search fallback...")
 
-            web_docs = self.web_search_fallback(question)
+            web_docs = await (web_task or self.aweb_search_fallback(question))
 
             if web_docs:
-                # Combine and prioritize web results
-                docs = web_docs + docs
+                # Combine and prioritize web results - the speculative answer is stale now
+                await self._discard(answer_task)
+                verification = None
+                docs = self._merge_topk(web_docs, docs, k=k)
                 used_web_search = True
-                print(f"✅ Using combined web and vector search results")
+                logger.debug("✅ Using combined web and vector search results")
             else:
-                print(f"⚠️  Web search failed, using vector DB results anyway")
+                logger.warning("⚠️  Web search failed, using vector DB results anyway")
         else:
-            print(f"\n✅ Step 3: Skipped (relevance score sufficient)")
-
-        # Step 4: Generate answer
-        print(f"\n🤖 Step 4: Generating answer...")
-        context = self.format_docs(docs)
-        answer = self.generate_answer(question, context)
+            await self._discard(web_task)
+            logger.debug("✅ Step 3: Skipped (relevance score sufficient)")
+
+        # Step 4: Generate answer (or take the speculative one if the context is unchanged)
+        logger.debug("🤖 Step 4: Generating answer...")
+        if used_web_search:
+            context = self.format_docs(docs)
+            answer = await self.agenerate_answer(question, context)
+        elif stream_verify:
+            answer, *verification = await answer_task
+        elif answer_task:
+            answer = await answer_task
+        elif cached_answer is not None:
+            answer = cached_answer
+        else:
+            # Fallback was certain but found nothing - answer from the vector DB docs
+            answer = await self.agenerate_answer(question, context)
 
         # Step 4.5: Feedback loop refinement (NEW)
         used_feedback_loop = False
         if enable_feedback_loop:
             original_answer = answer
-            docs, answer = self.refine_with_feedback(question, docs, answer)
+            docs, answer = await self.arefine_with_feedback(question, docs, answer)
             if answer != original_answer:
                 used_feedback_loop = True
+                verification = None
                 context = self.format_docs(docs)  # Update context
-                print(f"✅ Feedback loop applied - answer refined")
+                logger.debug("✅ Feedback loop applied - answer refined")
 
         # Step 5: Verify answer (self-reflection)
         is_grounded = True
         verification_feedback = "Verification skipped"
 
         if enable_verification:
-            print(f"\n🔍 Step 5: Verifying answer is grounded...")
-            is_grounded, verification_feedback = self.verify_answer(
-                question, answer, context
-            )
-            print(f"   Grounded: {'✅ YES' if is_grounded else '❌ NO'}")
-            print(f"   Feedback: {verification_feedback}")
+            logger.debug("🔍 Step 5: Verifying answer is grounded...")
+            if verification:
+                # Already verified by the fused call in Step 2 (answer and context unchanged)
+                is_grounded, verification_feedback = verification
+            else:
+                is_grounded, verification_feedback = await self.averify_answer(
+                    question, answer, context
+                )
+            logger.debug("   Grounded: %s", '✅ YES' if is_grounded else '❌ NO')
+            logger.debug("   Feedback: %s", verification_feedback)
         else:
-            print(f"\n⏭️  Step 5: Skipped (verification disabled)")
+            logger.debug("⏭️  Step 5: Skipped (verification disabled)")
 
         # Prepare response
         response = {
             "question": question,
             "answer": answer,
-            "sources": [
-                {
-                    "title": doc.metadata.get('title', 'Unknown'),
-                    "source": doc.metadata.get('source', 'Unknown'),
-                    "genre": doc.metadata.get('genre', 'N/A'),
-                    "rating": doc.metadata.get('rating', 'N/A')
-                }
-                for doc in docs
-            ],
+            "sources": [doc_to_source(doc, missing='N/A') for doc in docs],
             "metadata": {
                 "strategy": strategy,
                 "relevance_score": relevance_score,
@@ -375,9 +910,7 @@ Feedback (one sentence):"""
             }
         }
 
-        print(f"\n{'='*80}")
-        print(f"✅ CORRECTIVE RAG COMPLETE")
-        print(f"{'='*80}\n")
+        logger.debug("✅ CORRECTIVE RAG COMPLETE")
 
         return response
 
@@ -401,60 +934,55 @@ Feedback (one sentence):"""
         """
         # Retrieve MORE docs to filter for quality and relevance
         docs = self.retrieve(query, k=num_suggestions * 5)
+        if not docs:
+            return []
 
         # Check if query mentions actors (simple detection)
-        query_lower = query.lower()
-        words = query_lower.split()
-
-        # Extract unique HIGH-QUALITY titles only
-        suggestions = []
-        seen_titles = set()
-
-        for doc in docs:
-            if len(suggestions) >= num_suggestions:
-                break
-
-            title = doc.metadata.get('title', 'Unknown')
-            rating_str = doc.metadata.get('rating', '0')
-            content = doc.page_content.lower()
-
-            # Parse rating (handle different formats: "7.5", "7.5/10", etc.)
-            try:
-                rating = float(str(rating_str).split('/')[0])
-            except (ValueError, AttributeError):
-                rating = 0.0
+        words = query.lower().split()
+        meaningful_words = frozenset(w for w in words if len(w) > 3)
+
+        # Parallel arrays over the retrieved docs
+        titles = [doc.metadata.get('title', 'Unknown') for doc in docs]
+        ratings = np.fromiter(
+            (_parse_rating(str(doc.metadata.get('rating', '0'))) for doc in docs),
+            dtype=np.float64,
+            count=len(docs)
+        )
 
-            # QUALITY FILTER: Only recommend highly-rated movies (>= 6.5/10)
-            if rating < MIN_RATING_THRESHOLD:
-                continue
+        # QUALITY FILTER: Only recommend highly-rated movies (>= 6.5/10)
+        keep = ratings >= MIN_RATING_THRESHOLD
+
+        # ACTOR FILTER: If query seems actor-specific, verify presence in content.
+        # Multi-word query likely has specific intent - require at least 40% of
+        # meaningful words to match (one regex scan per doc)
+        if len(words) > 2 and meaningful_words:
+            pattern = query_terms_pattern(meaningful_words)
+            match_counts = np.fromiter(
+                (len(set(pattern.findall(doc.page_content.lower()))) for doc in docs),
+                dtype=np.int32,
+                count=len(docs)
+            )
+            keep &= match_counts >= len(meaningful_words) * 0.4
 
-            # ACTOR FILTER: If query seems actor-specific, verify presence in content
-            # Check if critical query terms appear in the document content
-            query_match_score = sum(1 for word in words if len(word) > 3 and word in content)
-
-            # If query has specific terms (like actor names), require minimum match
-            if len(words) > 2:  # Multi-word query likely has specific intent
-                # Require at least 50% of meaningful words to match
-                meaningful_words = [w for w in words if len(w) > 3]
-                if meaningful_words and query_match_score < len(meaningful_words) * 0.4:
-                    continue  # Skip if not enough term matches
-
-            if title not in seen_titles:
-                suggestions.append({
-                    "title": title,
-                    "genre": doc.metadata.get('genre', 'N/A'),
-                    "rating": f"{rating}/10",
-                    "source": doc.metadata.get('source', 'Unknown'),
-                    "year": doc.metadata.get('year', doc.metadata.get('release_year', 'N/A')),
-                    "relevance_score": query_match_score  # For debugging/ranking
-                })
-                seen_titles.add(title)
+        # Extract unique HIGH-QUALITY titles only (first hits in retrieval order)
+        selected = []
+        seen_titles = set()
+        for i in np.flatnonzero(keep):
+            if titles[i] not in seen_titles:
+                seen_titles.add(titles[i])
+                selected.append(i)
+                if len(selected) >= num_suggestions:
+                    break
 
         # Sort by rating (highest first) for best recommendations
-        suggestions.sort(key=lambda x: float(x['rating'].split('/')[0]), reverse=True)
+        selected = np.asarray(selected, dtype=np.intp)
+        selected = selected[np.argsort(-ratings[selected], kind="stable")]
 
-        # Remove relevance_score from final output
-        for suggestion in suggestions:
-            suggestion.pop('relevance_score', None)
+        suggestions = []
+        for i in selected:
+            suggestion = doc_to_source(docs[i], missing='N/A').to_dict()
+            suggestion["rating"] = f"{float(ratings[i])}/10"
+            suggestion["year"] = docs[i].metadata.get('year', docs[i].metadata.get('release_year', 'N/A'))
+            suggestions.append(suggestion)
 
         return suggestions
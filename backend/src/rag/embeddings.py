@@ -3,12 +3,19 @@ Embeddings Module - Handles document embedding and uploading to Pinecone.
 
 Flow:
 1. Load documents
-2. Generate embeddings using OpenAI
-3. Upload to Pinecone in batches
+2. Generate embeddings using OpenAI (several batches in flight at once;
+   vectors already in the on-disk cache are reused)
+3. Upload to Pinecone in batches (a background upserter overlaps with
+   embedding; async upserts over the gRPC channel)
 4. Track progress
 """
 
-from typing import List
+import asyncio
+import hashlib
+import itertools
+
+import numpy as np
+from typing import Dict, Iterable, Iterator, List, Tuple
 from langchain_core.documents import Document
 from langchain_openai import OpenAIEmbeddings
 from langchain_pinecone import PineconeVectorStore
@@ -17,9 +24,186 @@ from tqdm import tqdm
 from src.config import (
     OPENAI_API_KEY,
     EMBEDDING_MODEL,
-    PINECONE_INDEX_NAME,
-    PINECONE_API_KEY
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_BATCH_MAX_TOKENS,
+    EMBEDDING_MAX_RETRIES,
+    MAX_CONCURRENT_EMBEDDING_BATCHES,
+    PINECONE_UPSERT_BATCH_SIZE,
+    UPSERT_QUEUE_SIZE
 )
+from src.rag.vector_store import get_grpc_index
+from src.utils.aio import run_sync
+from src.utils.embedding_cache import EmbeddingCache, embedding_cache_key
+from src.utils.rate_limit import throttled
+
+
+def chunks(iterable: Iterable, batch_size: int = PINECONE_UPSERT_BATCH_SIZE) -> Iterator[Tuple]:
+    """Break an iterable into tuples of at most `batch_size` items."""
+    it = iter(iterable)
+    chunk = tuple(itertools.islice(it, batch_size))
+    while chunk:
+        yield chunk
+        chunk = tuple(itertools.islice(it, batch_size))
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for batching (~4 characters per token for English)."""
+    return len(text) // 4 + 1
+
+
+def pack_batches(
+    texts: List[str],
+    max_items: int = EMBEDDING_BATCH_SIZE,
+    max_tokens: int = EMBEDDING_BATCH_MAX_TOKENS
+) -> List[List[int]]:
+    """
+    Greedily pack texts into embeddings requests.
+
+    Texts are sorted longest first, then each batch is filled until the
+    next one would exceed `max_items` or the estimated `max_tokens`, so every
+    request is as full as the API allows.
+
+    Args:
+        texts: Texts to embed
+        max_items: Maximum texts per request
+        max_tokens: Maximum estimated tokens per request
+
+    Returns:
+        Batches of positions in `texts`
+    """
+    batches = []
+    batch, batch_tokens = [], 0
+
+    for i in sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True):
+        tokens = estimate_tokens(texts[i])
+        if batch and (len(batch) >= max_items or batch_tokens + tokens > max_tokens):
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+        batch.append(i)
+        batch_tokens += tokens
+
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def l2_normalize(vectors: List[List[float]]) -> List[List[float]]:
+    """Scale each vector to unit length (dot product then equals cosine similarity)."""
+    array = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(array, axis=-1, keepdims=True)
+    return (array / np.where(norms == 0, 1, norms)).tolist()
+
+
+def document_id(text: str, metadata: Dict) -> str:
+    """
+    Stable vector id for a dataset row.
+
+    Derived from the source plus the row's id, or its full text for datasets
+    without an id column (metadata alone can't tell apart rows that share a
+    title and leave year/director blank), so re-uploading the same row
+    overwrites its vector instead of adding another copy.
+    """
+    source = str(metadata.get("source") or "")
+    if metadata.get("show_id"):
+        key = f"{source}|{metadata['show_id']}"
+    else:
+        key = f"{source}|{text}"
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def upsert_embeddings(
+    index,
+    documents: List[Document],
+    vectors: List[List[float]],
+    batch_size: int = PINECONE_UPSERT_BATCH_SIZE
+):
+    """Upsert precomputed vectors for Documents (see `upsert_vectors`)."""
+    upsert_vectors(
+        index,
+        [doc.page_content for doc in documents],
+        [doc.metadata for doc in documents],
+        vectors,
+        batch_size
+    )
+
+
+def upsert_vectors(
+    index,
+    texts: List[str],
+    metadatas: List[Dict],
+    vectors: List[List[float]],
+    batch_size: int = PINECONE_UPSERT_BATCH_SIZE
+):
+    """
+    Upsert precomputed vectors (with LangChain-compatible metadata) into Pinecone.
+
+    All batches are sent with async_req=True (on the REST index's thread
+    pool, or as gRPC futures); we only block once every request is in flight.
+    """
+    # The index uses the dotproduct metric, which assumes unit vectors
+    vectors = l2_normalize(vectors) if vectors else []
+    records = (
+        (document_id(text, metadata), vector, {**metadata, "text": text})
+        for text, metadata, vector in zip(texts, metadatas, vectors)
+    )
+    async_results = [
+        index.upsert(vectors=batch, async_req=True)
+        for batch in chunks(records, batch_size)
+    ]
+    # Wait for every upsert to finish (re-raises the first failure);
+    # gRPC returns futures, the REST client ApplyResults
+    for async_result in async_results:
+        if hasattr(async_result, "result"):
+            async_result.result()
+        else:
+            async_result.get()
+
+
+class _UpsertQueue:
+    """
+    Bounded queue of embedded batches, drained into Pinecone by one background task.
+
+    Embedding and upserting overlap: a batch is handed off as soon as its
+    vectors arrive, so the embedding slot is free for the next batch while
+    this one uploads. `maxsize` provides backpressure (at most that many
+    embedded batches wait in memory).
+    """
+
+    def __init__(self, index, progress: tqdm, maxsize: int = UPSERT_QUEUE_SIZE):
+        self.index = index
+        self.progress = progress
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._error = None
+        self._worker = asyncio.create_task(self._drain())
+
+    async def put(self, texts: List[str], metadatas: List[Dict], vectors: List[List[float]]):
+        """Queue one embedded batch (waits while the queue is full)."""
+        if self._error is not None:
+            raise self._error
+        await self._queue.put((texts, metadatas, vectors))
+
+    async def _drain(self):
+        while True:
+            texts, metadatas, vectors = await self._queue.get()
+            try:
+                # After a failure, keep draining (so producers never block) but skip the work
+                if self._error is None:
+                    await asyncio.to_thread(upsert_vectors, self.index, texts, metadatas, vectors)
+                    self.progress.update(len(texts))
+            except Exception as exc:
+                self._error = exc
+            finally:
+                self._queue.task_done()
+
+    async def join(self):
+        """Wait for every queued batch to be upserted; re-raises the first upsert failure."""
+        await self._queue.join()
+        if self._error is not None:
+            raise self._error
+
+    def cancel(self):
+        """Stop the background upserter."""
+        self._worker.cancel()
 
 
 class DocumentEmbedder:
@@ -42,20 +226,26 @@ class DocumentEmbedder:
         """Initialize embeddings model."""
         self.embeddings = OpenAIEmbeddings(
             model=EMBEDDING_MODEL,
-            openai_api_key=OPENAI_API_KEY
+            openai_api_key=OPENAI_API_KEY,
+            chunk_size=EMBEDDING_BATCH_SIZE,
+            max_retries=EMBEDDING_MAX_RETRIES
         )
+        self.cache = EmbeddingCache()
 
     def embed_and_upload(
         self,
         documents: List[Document],
-        batch_size: int = 100
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        max_concurrent_batches: int = MAX_CONCURRENT_EMBEDDING_BATCHES
     ):
         """
         Embed documents and upload to Pinecone.
 
         Args:
             documents: List of LangChain Document objects
-            batch_size: Number of docs to process at once
+            batch_size: Maximum docs per embeddings request (batches are also
+                capped at EMBEDDING_BATCH_MAX_TOKENS estimated tokens)
+            max_concurrent_batches: Embedding requests in flight at once
 
         Best Practices:
         - Use batches to avoid rate limits
@@ -63,19 +253,191 @@ class DocumentEmbedder:
         - Preserve all metadata
         - Handle errors gracefully
         """
-        print(f"\n🚀 Embedding {len(documents)} documents...")
-        print(f"💰 Estimated cost: ~$0.03 (using {EMBEDDING_MODEL})")
+        return run_sync(self.aembed_and_upload(documents, batch_size, max_concurrent_batches))
+
+    async def aembed_and_upload(
+        self,
+        documents: List[Document],
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        max_concurrent_batches: int = MAX_CONCURRENT_EMBEDDING_BATCHES
+    ):
+        """Async version of `embed_and_upload`."""
+        return await self.aembed_and_upload_raw(
+            [doc.page_content for doc in documents],
+            [doc.metadata for doc in documents],
+            batch_size,
+            max_concurrent_batches
+        )
 
-        # Create vector store (automatically embeds + uploads)
-        vector_store = PineconeVectorStore.from_documents(
-            documents=documents,
-            embedding=self.embeddings,
-            index_name=PINECONE_INDEX_NAME,
-            batch_size=batch_size
+    def embed_and_upload_raw(
+        self,
+        texts: List[str],
+        metadatas: List[Dict],
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        max_concurrent_batches: int = MAX_CONCURRENT_EMBEDDING_BATCHES
+    ):
+        """
+        Embed texts and upload them to Pinecone with their metadata.
+
+        Same as `embed_and_upload` for callers that never built Document
+        objects (e.g. `MovieDocumentLoader.load_all_raw`).
+
+        Args:
+            texts: Page contents to embed
+            metadatas: Metadata dict per text
+            batch_size: Maximum texts per embeddings request
+            max_concurrent_batches: Embedding requests in flight at once
+        """
+        return run_sync(
+            self.aembed_and_upload_raw(texts, metadatas, batch_size, max_concurrent_batches)
         )
 
-        print(f"\n✅ Successfully uploaded {len(documents)} vectors!")
-        return vector_store
+    async def aembed_and_upload_raw(
+        self,
+        texts: List[str],
+        metadatas: List[Dict],
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        max_concurrent_batches: int = MAX_CONCURRENT_EMBEDDING_BATCHES
+    ):
+        """
+        Async version of `embed_and_upload_raw`.
+
+        Batches are embedded concurrently (bounded by a semaphore, with 429
+        backoff) and each batch is upserted as soon as its vectors arrive,
+        so total time is bounded by OpenAI throughput rather than round trips.
+        Documents whose text was embedded on a previous run are served from
+        the on-disk cache.
+        """
+        print(f"\n🚀 Embedding {len(texts)} documents...")
+        print(f"💰 Estimated cost: ~$0.03 (using {EMBEDDING_MODEL})")
+
+        semaphore = asyncio.Semaphore(max_concurrent_batches)
+        progress = tqdm(total=len(texts), desc="Embedding + uploading")
+        upserts = _UpsertQueue(self._upsert_index(), progress)
+
+        try:
+            await self._aembed_and_upsert(upserts, texts, metadatas, batch_size, semaphore)
+            await upserts.join()
+        finally:
+            upserts.cancel()
+            progress.close()
+
+        print(f"\n✅ Successfully uploaded {len(texts)} vectors!")
+        return PineconeVectorStore(index=get_grpc_index(), embedding=self.embeddings)
+
+    def embed_and_upload_stream(
+        self,
+        chunks: Iterable[Tuple[List[str], List[Dict]]],
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        max_concurrent_batches: int = MAX_CONCURRENT_EMBEDDING_BATCHES
+    ):
+        """
+        Embed and upload (texts, metadatas) chunks as they are produced.
+
+        Unlike `embed_and_upload_raw`, the full dataset is never in memory:
+        at most `max_concurrent_batches` chunks are being processed while the
+        next one is read (e.g. from `MovieDocumentLoader.iter_all_raw`).
+
+        Args:
+            chunks: Iterable of (texts, metadata dicts) pairs
+            batch_size: Maximum texts per embeddings request
+            max_concurrent_batches: Embedding requests (and chunks) in flight at once
+        """
+        return run_sync(self.aembed_and_upload_stream(chunks, batch_size, max_concurrent_batches))
+
+    async def aembed_and_upload_stream(
+        self,
+        chunks: Iterable[Tuple[List[str], List[Dict]]],
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        max_concurrent_batches: int = MAX_CONCURRENT_EMBEDDING_BATCHES
+    ):
+        """Async version of `embed_and_upload_stream`."""
+        print(f"\n🚀 Streaming documents into Pinecone (using {EMBEDDING_MODEL})...")
+
+        semaphore = asyncio.Semaphore(max_concurrent_batches)
+        progress = tqdm(desc="Embedding + uploading")
+        upserts = _UpsertQueue(self._upsert_index(), progress)
+        iterator = iter(chunks)
+        pending = set()
+        total = 0
+
+        try:
+            while True:
+                # CSV parsing is blocking - keep it off the event loop
+                chunk = await asyncio.to_thread(next, iterator, None)
+                if chunk is None:
+                    break
+
+                texts, metadatas = chunk
+                total += len(texts)
+                pending.add(asyncio.create_task(
+                    self._aembed_and_upsert(upserts, texts, metadatas, batch_size, semaphore)
+                ))
+
+                # Bound memory: wait for a chunk to be embedded before reading more
+                if len(pending) >= max_concurrent_batches:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        task.result()
+
+            await asyncio.gather(*pending)
+            await upserts.join()
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            raise
+        finally:
+            upserts.cancel()
+            progress.close()
+
+        print(f"\n✅ Successfully uploaded {total} vectors!")
+        return PineconeVectorStore(index=get_grpc_index(), embedding=self.embeddings)
+
+    @staticmethod
+    def _upsert_index():
+        """Pinecone index handle for parallel async upserts (shared gRPC channel)."""
+        return get_grpc_index()
+
+    async def _aembed_and_upsert(
+        self,
+        upserts: _UpsertQueue,
+        texts: List[str],
+        metadatas: List[Dict],
+        batch_size: int,
+        semaphore: asyncio.Semaphore
+    ):
+        """
+        Embed (cache first) one set of texts, packed into requests, and queue them for upsert.
+
+        Args:
+            upserts: Queue feeding the background Pinecone upserter
+            texts: Page contents to embed
+            metadatas: Metadata dict per text
+            batch_size: Maximum texts per embeddings request
+            semaphore: Limits embedding requests in flight across callers
+        """
+        async def embed_and_upsert(positions: List[int]):
+            batch_texts = [texts[i] for i in positions]
+            keys = [embedding_cache_key(EMBEDDING_MODEL, text) for text in batch_texts]
+            vectors_by_key = self.cache.get_many(keys)
+
+            # Only embed what the cache doesn't have
+            missing = {key: text for key, text in zip(keys, batch_texts) if key not in vectors_by_key}
+            if missing:
+                missing_texts = list(missing.values())
+                async with semaphore:
+                    fresh = await throttled(lambda: self.embeddings.aembed_documents(missing_texts))
+                fresh_by_key = dict(zip(missing, fresh))
+                self.cache.set_many(fresh_by_key.items())
+                vectors_by_key.update(fresh_by_key)
+
+            vectors = [vectors_by_key[key] for key in keys]
+            batch_metadatas = [metadatas[i] for i in positions]
+            await upserts.put(batch_texts, batch_metadatas, vectors)
+
+        await asyncio.gather(*[
+            embed_and_upsert(positions) for positions in pack_batches(texts, max_items=batch_size)
+        ])
 
     def embed_query(self, query: str) -> List[float]:
         """
@@ -85,6 +447,7 @@ class DocumentEmbedder:
             query: Search query text
 
         Returns:
-            Embedding vector (1536 dimensions)
+            Unit-length embedding vector (1536 dimensions)
         """
-        return self.embeddings.embed_query(query)
+        vector, = l2_normalize([self.embeddings.embed_query(query)])
+        return vector
@@ -10,11 +10,57 @@ Combines:
 Allows switching between strategies.
 """
 
-from typing import List, Dict
+import asyncio
+import logging
+import re
+from collections import defaultdict
+from typing import Hashable, List, Dict, Optional, Tuple
+
+import numpy as np
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 
+from src.config import RRF_K, RESPONSE_CACHE_THRESHOLD, RESPONSE_CACHE_TTL_SECONDS
 from src.rag.basic_rag import BasicRAG
 from src.rag.query_enhancement import QueryEnhancer
+from src.rag.semantic_cache import SemanticCache, make_guard
+from src.rag.sources import doc_to_source
+from src.utils.aio import run_sync
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _query_terms(question: str) -> str:
+    """
+    Normalized query terms for the response cache guard.
+
+    Embeddings of "movies like Inception" and "movies like Interstellar"
+    can clear the similarity threshold; requiring the same set of words
+    keeps paraphrases that only reorder or re-punctuate a question as hits.
+    """
+    return " ".join(sorted(set(_WORD_RE.findall(question.lower()))))
+
+
+def _doc_key(doc: Document) -> Hashable:
+    """
+    Identity of a retrieved document across result lists.
+
+    Prefers the Pinecone vector id, then the dataset's own id, then the
+    title (both scoped by source); content as a last resort, so untitled
+    docs are still merged rather than dropped.
+    """
+    if doc.id:
+        return doc.id
+
+    metadata = doc.metadata
+    source = metadata.get('source', '')
+    if metadata.get('show_id'):
+        return (source, metadata['show_id'])
+    if metadata.get('title'):
+        return (source, metadata['title'])
+    return doc.page_content
 
 
 class EnhancedRAG(BasicRAG):
@@ -27,11 +73,18 @@ class EnhancedRAG(BasicRAG):
     - Query expansion for recall
     """
 
-    def __init__(self):
-        """Initialize enhanced RAG components."""
-        super().__init__()
+    def __init__(self, embeddings: Optional[Embeddings] = None):
+        """Initialize enhanced RAG components (see `BasicRAG.__init__`)."""
+        super().__init__(embeddings)
         self.query_enhancer = QueryEnhancer()
 
+        # Whole query_enhanced responses, reused by close paraphrases with the
+        # same query terms (skips query enhancement, retrieval and generation)
+        self.response_cache = SemanticCache(
+            threshold=RESPONSE_CACHE_THRESHOLD,
+            ttl_seconds=RESPONSE_CACHE_TTL_SECONDS
+        )
+
     def retrieve_with_hyde(self, query: str, k: int = 5) -> List[Document]:
         """
         Retrieve using HyDE strategy.
@@ -48,25 +101,38 @@ class EnhancedRAG(BasicRAG):
         Returns:
             List of relevant documents
         """
-        print(f"🔮 Using HyDE strategy...")
+        logger.debug("🔮 Using HyDE strategy...")
 
         # Generate hypothetical answer
         hypothetical_answer = self.query_enhancer.hyde(query)
-        print(f"💭 Hypothetical answer: {hypothetical_answer[:100]}...")
+        logger.debug("💭 Hypothetical answer: %s...", hypothetical_answer[:100])
 
         # Search using the hypothetical answer
-        docs = self.vector_store.similarity_search(hypothetical_answer, k=k)
+        docs = self._with_scores(
+            self.vector_store.similarity_search_with_score(hypothetical_answer, k=k)
+        )
 
         return docs
 
+    async def aretrieve_with_hyde(self, query: str, k: int = 5) -> List[Document]:
+        """Async version of `retrieve_with_hyde`."""
+        logger.debug("🔮 Using HyDE strategy...")
+
+        hypothetical_answer = await self.query_enhancer.ahyde(query)
+        logger.debug("💭 Hypothetical answer: %s...", hypothetical_answer[:100])
+
+        return await self._asearch_query(hypothetical_answer, k)
+
     def retrieve_with_multi_query(self, query: str, k: int = 5) -> List[Document]:
         """
         Retrieve using multi-query strategy with PARALLEL searches.
 
         Steps:
-        1. Generate 3 query variations
-        2. Search with each variation IN PARALLEL
-        3. Merge and deduplicate results
+        1. Generate 3 query variations (the original query is searched meanwhile)
+        2. Embed all variations in ONE batched embeddings call
+        3. Search with each vector IN PARALLEL
+        4. Merge with reciprocal rank fusion (docs found by several variations rank higher)
+        5. Rerank the fused candidates by cosine similarity to the ORIGINAL query
 
         Args:
             query: User question
@@ -75,39 +141,155 @@ class EnhancedRAG(BasicRAG):
         Returns:
             Merged list of relevant documents
         """
-        from concurrent.futures import ThreadPoolExecutor
+        return run_sync(self.aretrieve_with_multi_query(query, k=k))
+
+    async def aretrieve_with_multi_query(self, query: str, k: int = 5) -> List[Document]:
+        """Async version of `retrieve_with_multi_query` (searches run concurrently)."""
+        logger.debug("🔀 Using Multi-Query strategy...")
+
+        num_variations = 3
+        per_query_k = max(2, k // (num_variations + 1))  # Split k across queries
+
+        # Head start: search the original query while the LLM writes variations
+        original_search = asyncio.create_task(self._asearch_query(query, per_query_k))
+        try:
+            queries = await self.query_enhancer.amulti_query(query, num_variations=num_variations)
+        except BaseException:
+            original_search.cancel()
+            raise
+        logger.debug("📝 Generated %s query variations", len(queries))
+
+        for i, q in enumerate(queries, 1):
+            logger.debug("   %s. '%s'", i, q)
+
+        # queries[0] is the original; one embeddings round-trip for the rest
+        query_vector, *vectors = await self._aembed_queries(queries)
+        original_docs, *variation_results = await asyncio.gather(
+            original_search,
+            *[
+                asyncio.to_thread(self._search_vector_with_values, vector, per_query_k)
+                for vector in vectors
+            ]
+        )
+
+        # Fuse into a 2k candidate pool, then keep the k closest to what was asked
+        doc_vectors = {doc.id: values for results in variation_results for doc, values in results}
+        candidates = self._reciprocal_rank_fusion(
+            [original_docs] + [[doc for doc, _ in results] for results in variation_results],
+            k * 2
+        )
+        return self._rerank_by_cosine(query_vector, candidates, doc_vectors, k)
+
+    async def _asearch_query(self, query: str, k: int) -> List[Document]:
+        """Embed (cached) and search a single query."""
+        vector, = await self._aembed_queries([query])
+        return await self._asearch_vector(vector, k)
+
+    async def _asearch_vector(self, vector: List[float], k: int) -> List[Document]:
+        """Similarity search by vector, with scores stored on the docs."""
+        results = await self._asearch_by_vector_with_score(vector, k)
+        return self._with_scores(results)
+
+    def _search_vector_with_values(
+        self,
+        vector: List[float],
+        k: int
+    ) -> List[Tuple[Document, List[float]]]:
+        """
+        Similarity search that also returns each match's stored vector.
 
-        print(f"🔀 Using Multi-Query strategy...")
+        Same Documents as `similarity_search_by_vector_with_score` (scores in
+        metadata), paired with their embeddings for local reranking.
+        """
+        results = self.vector_store.index.query(
+            vector=vector,
+            top_k=k,
+            include_metadata=True,
+            include_values=True
+        )
+
+        pairs = []
+        for match in results["matches"]:
+            metadata = dict(match["metadata"] or {})
+            text = metadata.pop("text", None)
+            if text is None:
+                continue
+            metadata["similarity_score"] = float(match["score"])
+            pairs.append((Document(id=match["id"], page_content=text, metadata=metadata), match["values"]))
+        return pairs
+
+    @staticmethod
+    def _rerank_by_cosine(
+        query_vector: List[float],
+        docs: List[Document],
+        doc_vectors: Dict[str, List[float]],
+        k: int
+    ) -> List[Document]:
+        """
+        Order candidates by cosine similarity to the original query.
+
+        Docs without a fetched vector (found only by the original query's
+        search) already carry that exact score in metadata["similarity_score"].
+        The score is updated on every doc, so later stages (e.g. the
+        corrective relevance shortcut) see similarity to the real question.
 
-        # Generate query variations
-        queries = self.query_enhancer.multi_query(query, num_variations=3)
-        print(f"📝 Generated {len(queries)} query variations")
+        Args:
+            query_vector: Embedding of the original query
+            docs: Fused candidates
+            doc_vectors: Stored embeddings by document id
+            k: Number of docs to keep
 
-        # Retrieve from each query IN PARALLEL
-        per_query_k = max(2, k // len(queries))  # Split k across queries
+        Returns:
+            Top k docs, most similar first
+        """
+        if not docs:
+            return docs
+
+        scores = np.array(
+            [doc.metadata.get("similarity_score", 0.0) for doc in docs],
+            dtype=np.float32
+        )
+        with_vectors = [i for i, doc in enumerate(docs) if doc.id in doc_vectors]
+        if with_vectors:
+            matrix = np.asarray([doc_vectors[docs[i].id] for i in with_vectors], dtype=np.float32)
+            query = np.asarray(query_vector, dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+            scores[with_vectors] = (matrix @ query) / np.maximum(norms, 1e-12)
+
+        order = np.argsort(-scores, kind="stable")[:k]
+        reranked = []
+        for i in order:
+            docs[i].metadata["similarity_score"] = float(scores[i])
+            reranked.append(docs[i])
+        return reranked
+
+    @staticmethod
+    def _reciprocal_rank_fusion(result_lists: List[List[Document]], k: int) -> List[Document]:
+        """
+        Fuse ranked lists with reciprocal rank fusion.
 
-        def search_query(q_tuple):
-            i, q = q_tuple
-            print(f"   {i}. '{q}'")
-            return self.vector_store.similarity_search(q, k=per_query_k)
+        Each document scores sum(1 / (RRF_K + rank)) over the lists it appears
+        in (documents are identified by `_doc_key`), so docs found by several
+        strategies rise to the top.
 
-        # Run all 3 searches in parallel (much faster!)
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            query_results = list(executor.map(search_query, enumerate(queries, 1)))
+        Args:
+            result_lists: Ranked documents per retrieval
+            k: Number of docs to keep
 
-        # Merge and deduplicate results
-        all_docs = []
-        seen_titles = set()
+        Returns:
+            Top k fused documents
+        """
+        scores = defaultdict(float)
+        first_seen = {}
 
-        for docs in query_results:
-            for doc in docs:
-                title = doc.metadata.get('title', '')
-                if title and title not in seen_titles:
-                    seen_titles.add(title)
-                    all_docs.append(doc)
+        for docs in result_lists:
+            for rank, doc in enumerate(docs, 1):
+                key = _doc_key(doc)
+                scores[key] += 1.0 / (RRF_K + rank)
+                first_seen.setdefault(key, doc)
 
-        # Return top k unique docs
-        return all_docs[:k]
+        ranked = sorted(scores, key=scores.__getitem__, reverse=True)
+        return [first_seen[key] for key in ranked[:k]]
 
     def retrieve_with_expansion(self, query: str, k: int = 5) -> List[Document]:
         """
@@ -124,17 +306,28 @@ class EnhancedRAG(BasicRAG):
         Returns:
             List of relevant documents
         """
-        print(f"➕ Using Query Expansion strategy...")
+        logger.debug("➕ Using Query Expansion strategy...")
 
         # Expand query
         expanded_query = self.query_enhancer.expand_query(query)
-        print(f"📝 Expanded query: {expanded_query}")
+        logger.debug("📝 Expanded query: %s", expanded_query)
 
         # Search with expanded query
-        docs = self.vector_store.similarity_search(expanded_query, k=k)
+        docs = self._with_scores(
+            self.vector_store.similarity_search_with_score(expanded_query, k=k)
+        )
 
         return docs
 
+    async def aretrieve_with_expansion(self, query: str, k: int = 5) -> List[Document]:
+        """Async version of `retrieve_with_expansion`."""
+        logger.debug("➕ Using Query Expansion strategy...")
+
+        expanded_query = await self.query_enhancer.aexpand_query(query)
+        logger.debug("📝 Expanded query: %s", expanded_query)
+
+        return await self._asearch_query(expanded_query, k)
+
     def query_enhanced(
         self,
         question: str,
@@ -154,10 +347,19 @@ class EnhancedRAG(BasicRAG):
             k: Number of documents to retrieve
 
         Returns:
-            Dictionary with answer and sources
+            Dictionary with answer, sources and the retrieved Document objects
+            (so callers can score them without retrieving again)
         """
-        print(f"\n🎯 Strategy: {strategy.upper()}")
-        print(f"🔍 Retrieving relevant documents...\n")
+        logger.debug("🎯 Strategy: %s", strategy.upper())
+
+        vector = self._embed_query(question)
+        guard = make_guard("enhanced", strategy, str(k), _query_terms(question))
+        cached = self.response_cache.check(vector, guard)
+        if cached is not None:
+            logger.debug("⚡ Response cache hit")
+            return {**cached, "question": question}
+
+        logger.debug("🔍 Retrieving relevant documents...")
 
         # Choose retrieval strategy
         if strategy == "hyde":
@@ -169,8 +371,8 @@ class EnhancedRAG(BasicRAG):
         else:  # basic
             docs = self.retrieve(question, k=k)
 
-        print(f"\n✅ Found {len(docs)} relevant documents")
-        print(f"🤖 Generating answer...\n")
+        logger.debug("✅ Found %s relevant documents", len(docs))
+        logger.debug("🤖 Generating answer...")
 
         # Format context
         context = self.format_docs(docs)
@@ -178,21 +380,56 @@ class EnhancedRAG(BasicRAG):
         # Generate answer
         answer = self.generate_answer(question, context)
 
-        # Prepare response
+        response = self._build_response(question, strategy, answer, docs)
+        self.response_cache.store(vector, guard, response)
+        return response
+
+    async def aquery_enhanced(
+        self,
+        question: str,
+        strategy: str = "multi_query",
+        k: int = 5
+    ) -> Dict:
+        """Async version of `query_enhanced` (same strategies and response shape)."""
+        logger.debug("🎯 Strategy: %s", strategy.upper())
+
+        vector = await asyncio.to_thread(self._embed_query, question)
+        guard = make_guard("enhanced", strategy, str(k), _query_terms(question))
+        cached = self.response_cache.check(vector, guard)
+        if cached is not None:
+            logger.debug("⚡ Response cache hit")
+            return {**cached, "question": question}
+
+        logger.debug("🔍 Retrieving relevant documents...")
+
+        if strategy == "hyde":
+            docs = await self.aretrieve_with_hyde(question, k=k)
+        elif strategy == "multi_query":
+            docs = await self.aretrieve_with_multi_query(question, k=k)
+        elif strategy == "expansion":
+            docs = await self.aretrieve_with_expansion(question, k=k)
+        else:  # basic
+            docs = await self.aretrieve(question, k=k)
+
+        logger.debug("✅ Found %s relevant documents", len(docs))
+        logger.debug("🤖 Generating answer...")
+
+        answer = await self.agenerate_answer(question, self.format_docs(docs))
+
+        response = self._build_response(question, strategy, answer, docs)
+        self.response_cache.store(vector, guard, response)
+        return response
+
+    @staticmethod
+    def _build_response(question: str, strategy: str, answer: str, docs: List[Document]) -> Dict:
+        """Prepare the query_enhanced response dict."""
         response = {
             "question": question,
             "strategy": strategy,
             "answer": answer,
-            "sources": [
-                {
-                    "title": doc.metadata.get('title', 'Unknown'),
-                    "source": doc.metadata.get('source', 'Unknown'),
-                    "genre": doc.metadata.get('genre', 'Unknown'),
-                    "rating": doc.metadata.get('rating', 'Unknown')
-                }
-                for doc in docs
-            ],
-            "num_sources": len(docs)
+            "sources": [doc_to_source(doc) for doc in docs],
+            "num_sources": len(docs),
+            "documents": docs
         }
 
         return response
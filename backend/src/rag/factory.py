@@ -0,0 +1,52 @@
+"""
+Process-wide RAG pipeline instances for the test scripts.
+
+Building a pipeline creates the embeddings, vector store and chat clients
+(and opens their connections), so scripts in the same process share one
+instance per class, created on first use. Their query embeddings persist
+in the on-disk embedding cache, so the scripts' fixed questions are only
+embedded on the first run (the API builds its pipeline without this cache).
+"""
+
+from functools import lru_cache
+
+from langchain_openai import OpenAIEmbeddings
+
+from src.config import OPENAI_API_KEY, EMBEDDING_MODEL
+from src.rag.basic_rag import BasicRAG
+from src.rag.corrective_rag import CorrectiveRAG
+from src.rag.enhanced_rag import EnhancedRAG
+from src.utils.embedding_cache import CachedEmbeddings
+from src.utils.http_client import get_http_client, get_async_http_client
+
+
+@lru_cache(maxsize=None)
+def get_cached_embeddings() -> CachedEmbeddings:
+    """Query embeddings backed by the on-disk embedding cache."""
+    return CachedEmbeddings(
+        OpenAIEmbeddings(
+            model=EMBEDDING_MODEL,
+            openai_api_key=OPENAI_API_KEY,
+            http_client=get_http_client(),
+            http_async_client=get_async_http_client()
+        ),
+        model=EMBEDDING_MODEL
+    )
+
+
+@lru_cache(maxsize=None)
+def get_basic_rag() -> BasicRAG:
+    """Shared BasicRAG."""
+    return BasicRAG(get_cached_embeddings())
+
+
+@lru_cache(maxsize=None)
+def get_enhanced_rag() -> EnhancedRAG:
+    """Shared EnhancedRAG."""
+    return EnhancedRAG(get_cached_embeddings())
+
+
+@lru_cache(maxsize=None)
+def get_corrective_rag() -> CorrectiveRAG:
+    """Shared CorrectiveRAG."""
+    return CorrectiveRAG(get_cached_embeddings())
@@ -11,8 +11,12 @@ Best Practices:
 from langchain_core.prompts import ChatPromptTemplate
 
 
+# Answer prompts are split into a static system message (identical on every
+# request, so provider-side prompt caching reuses its prefill) followed by the
+# per-request context and question.
+
 # Basic RAG prompt template with system message
-BASIC_RAG_TEMPLATE = """You are an expert movie and TV show recommendation assistant with access to comprehensive databases including Netflix, IMDB, and top-rated international content.
+BASIC_RAG_SYSTEM = """You are an expert movie and TV show recommendation assistant with access to comprehensive databases including Netflix, IMDB, and top-rated international content.
 
 Your expertise includes:
 - Accurate actor/cast matching and filtering
@@ -25,20 +29,23 @@ CRITICAL INSTRUCTIONS:
 2. **Quality First**: Recommend the HIGHEST-RATED content (rating >= 6.5/10) from the context
 3. **Accuracy**: Double-check actor names in the Cast/Stars field before recommending
 4. **Concise Response**: Provide a SHORT, conversational answer (2-3 sentences) about ONE recommendation
-5. **Explain Choice**: Mention why it's a good choice (rating, genre match, actor confirmation)
+5. **Explain Choice**: Mention why it's a good choice (rating, genre match, actor confirmation)"""
 
-Context Information:
+BASIC_RAG_TEMPLATE = """Context Information:
 {context}
 
 User Question: {question}
 
 Your Answer (2-3 sentences, verify actor/cast if mentioned):"""
 
-basic_rag_prompt = ChatPromptTemplate.from_template(BASIC_RAG_TEMPLATE)
+basic_rag_prompt = ChatPromptTemplate.from_messages([
+    ("system", BASIC_RAG_SYSTEM),
+    ("human", BASIC_RAG_TEMPLATE)
+])
 
 
 # Prompt with explicit citation requirements and system message
-RAG_WITH_SOURCES_TEMPLATE = """You are an expert movie and TV show recommendation assistant with deep knowledge of global cinema, TV shows, and streaming content.
+RAG_WITH_SOURCES_SYSTEM = """You are an expert movie and TV show recommendation assistant with deep knowledge of global cinema, TV shows, and streaming content.
 
 Your role:
 - Provide accurate, well-researched recommendations
@@ -55,16 +62,19 @@ CRITICAL RULES:
 6. **Format Appropriately**: Use bullet points for multiple items, conversational tone for single recommendations
 7. **Transparency**: If the context doesn't contain what the user wants, clearly state this
 8. **Rich Details**: Include genre, rating, year, cast when available
-9. **Quality Filter**: Prioritize higher-rated content (>= 6.5/10)
+9. **Quality Filter**: Prioritize higher-rated content (>= 6.5/10)"""
 
-Context Information:
+RAG_WITH_SOURCES_TEMPLATE = """Context Information:
 {context}
 
 User Question: {question}
 
 Your Answer (prefer web search results if available, cite sources, verify actors):"""
 
-rag_with_sources_prompt = ChatPromptTemplate.from_template(RAG_WITH_SOURCES_TEMPLATE)
+rag_with_sources_prompt = ChatPromptTemplate.from_messages([
+    ("system", RAG_WITH_SOURCES_SYSTEM),
+    ("human", RAG_WITH_SOURCES_TEMPLATE)
+])
 
 
 # System message for conversational RAG
@@ -78,3 +88,157 @@ Your role is to:
 - Answer questions accurately based on available data
 
 Always be helpful, concise, and cite your sources."""
+
+
+# Compare endpoint prompts (plain str.format templates, filled per request).
+# Every variant starts with the same instruction preamble so providers with
+# automatic prompt caching can reuse the tokenized prefix across requests.
+COMPARE_INSTRUCTIONS = """Give a SHORT conversational answer (2-3 sentences). Recommend ONE movie rated 6.5/10+. Don't list multiple movies."""
+
+# RAG is excellent (relevance >= 8.5) - give it strong preference
+COMPARE_PREFER_RAG_TEMPLATE = COMPARE_INSTRUCTIONS + """
+
+Database (HIGHLY RELEVANT - Prefer this): {rag}
+Web (Additional context): {web}
+
+Short conversational answer (prefer database recommendation):"""
+
+# Both are good (relevance 7-8.5) - balanced combination
+COMPARE_BALANCED_TEMPLATE = COMPARE_INSTRUCTIONS + """
+
+Database: {rag}
+Web: {web}
+
+Short conversational answer (combine both sources):"""
+
+# RAG is weak (relevance < 7) - prefer web
+COMPARE_PREFER_WEB_TEMPLATE = COMPARE_INSTRUCTIONS + """
+
+Web (PRIMARY - Prefer this): {web}
+Database (Additional context): {rag}
+
+Short conversational answer (prefer web recommendation):"""
+
+EXTRACT_TITLES_TEMPLATE = """Extract ONLY movie/show titles from this text (at most 5). No explanations.
+
+Text: {text}
+
+Respond with JSON only: {{"titles": ["<title>", ...]}}"""
+
+
+# HyDE: hypothetical answer used as the search text
+HYDE_TEMPLATE = """You are a movie and TV show expert.
+
+Given the user's question, write a hypothetical answer that would appear in our database.
+Include specific movie/show titles, genres, actors, and descriptions.
+
+User Question: {query}
+
+Hypothetical Answer (2-3 sentences):"""
+
+hyde_prompt = ChatPromptTemplate.from_template(HYDE_TEMPLATE)
+
+
+# Multi-query: rephrasings of the question
+MULTI_QUERY_TEMPLATE = """You are a helpful assistant that generates multiple variations of a question.
+
+Generate {num_variations} different ways to ask the same question about movies/TV shows.
+Each variation should emphasize different aspects or use different terminology.
+
+Original Question: {query}
+
+Variations (one per line):"""
+
+multi_query_prompt = ChatPromptTemplate.from_template(MULTI_QUERY_TEMPLATE)
+
+
+# Query expansion: synonyms and related terms
+QUERY_EXPANSION_TEMPLATE = """You are a query expansion expert for movie/TV databases.
+
+Given a search query, add relevant synonyms and related terms.
+Include genre names, similar concepts, and alternative terminology.
+
+Original Query: {query}
+
+Expanded Query (add 3-5 related terms):"""
+
+query_expansion_prompt = ChatPromptTemplate.from_template(QUERY_EXPANSION_TEMPLATE)
+
+
+# Corrective RAG: relevance of retrieved docs (JSON verdict)
+RELEVANCE_SCORING_TEMPLATE = """You are an expert relevance scorer for a movie/TV recommendation system with advanced semantic understanding.
+
+Your task: Rate how well these documents can answer the user's question with HIGH PRECISION.
+
+CRITICAL SCORING CRITERIA:
+- **Actor/Cast Matching**: If user asks for specific actors, documents MUST contain those exact actors in Cast/Stars fields
+- **Semantic Relevance**: Documents must match the core intent (genre, theme, mood, specific attributes)
+- **Information Completeness**: Documents must have enough detail to answer comprehensively
+- **Quality**: Higher-rated content is more valuable for recommendations
+
+Scoring Guide (BE STRICT):
+- 0-3: Completely irrelevant, wrong topic, or missing critical filter (e.g., wrong actor)
+- 4-6: Somewhat related but missing key information or only partial match
+- 7-8: Relevant and can answer the question adequately
+- 9-10: Highly relevant, perfect match for all criteria, contains complete information
+
+User Question: {query}
+
+Retrieved Documents:
+{documents}
+
+Respond with JSON only:
+{{"score": <number 0-10>, "explanation": "<one sentence explaining your score>"}}"""
+
+relevance_scoring_prompt = ChatPromptTemplate.from_template(RELEVANCE_SCORING_TEMPLATE)
+
+
+# Corrective RAG: is the answer grounded in the context (JSON verdict)
+ANSWER_VERIFICATION_TEMPLATE = """You are a fact-checker for a Q&A system.
+
+Verify if the answer is fully grounded in the provided context.
+
+Rules:
+1. Answer should ONLY use information from context
+2. Flag any facts not present in context
+3. Check if citations are accurate
+
+Question: {question}
+
+Context:
+{context}
+
+Generated Answer:
+{answer}
+
+Respond with JSON only:
+{{"grounded": <true or false>, "feedback": "<one sentence>"}}"""
+
+answer_verification_prompt = ChatPromptTemplate.from_template(ANSWER_VERIFICATION_TEMPLATE)
+
+
+# Corrective RAG: relevance + groundedness in one call (JSON verdict)
+SCORE_AND_VERIFY_TEMPLATE = """You are an expert relevance scorer and fact-checker for a movie/TV recommendation system.
+
+Do TWO checks on the same context:
+
+1. RELEVANCE (0-10, BE STRICT): how well the context can answer the question.
+- If the user asks for specific actors, documents MUST contain those exact actors in Cast/Stars fields
+- 0-3: irrelevant or missing a critical filter; 4-6: partial match; 7-8: adequate; 9-10: perfect match
+
+2. GROUNDEDNESS: is the generated answer fully supported by the context?
+- The answer should ONLY use information from the context
+- Flag any facts not present in the context, check citations are accurate
+
+Question: {question}
+
+Context:
+{context}
+
+Generated Answer:
+{answer}
+
+Respond with JSON only:
+{{"relevance": <number 0-10>, "relevance_reason": "<one sentence>", "grounded": <true or false>, "grounded_reason": "<one sentence>"}}"""
+
+score_and_verify_prompt = ChatPromptTemplate.from_template(SCORE_AND_VERIFY_TEMPLATE)
@@ -5,14 +5,31 @@ Techniques:
 1. HyDE - Generate hypothetical answer, search for that
 2. Multi-Query - Generate variations of the query
 3. Query Expansion - Add synonyms and related terms
+
+Outputs are memoized per query in memory, and the LLM responses are also
+persisted in a SQLite cache so repeated queries skip the LLM round trip
+after a restart too.
 """
 
+import re
 from typing import List
+from langchain_community.cache import SQLiteCache
 from langchain_openai import ChatOpenAI
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import ChatPromptTemplate
 
-from src.config import OPENAI_API_KEY, CHAT_MODEL
+from src.config import (
+    OPENAI_API_KEY,
+    CHAT_MODEL,
+    QUERY_ENHANCEMENT_CACHE_SIZE,
+    QUERY_ENHANCEMENT_LLM_CACHE_PATH
+)
+from src.rag.prompts import hyde_prompt, multi_query_prompt, query_expansion_prompt
+from src.utils.cache import BoundedCache
+from src.utils.http_client import get_http_client, get_async_http_client
+from src.utils.rate_limit import throttled
+
+# "1. ", "2) ", "- ", "* " prefixes the LLM tends to put on variation lines
+_LIST_MARKER_RE = re.compile(r"^(?:[-*•]|\d+[.)])\s*")
 
 
 class QueryEnhancer:
@@ -27,12 +44,26 @@ class QueryEnhancer:
 
     def __init__(self):
         """Initialize LLM for query enhancement."""
+        QUERY_ENHANCEMENT_LLM_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
         self.llm = ChatOpenAI(
             model=CHAT_MODEL,
             temperature=0.7,  # Slightly creative for variations
-            openai_api_key=OPENAI_API_KEY
+            openai_api_key=OPENAI_API_KEY,
+            http_client=get_http_client(),
+            http_async_client=get_async_http_client(),
+            # Persistent exact-match cache for this model only (not set globally,
+            # so answer generation and scoring are unaffected)
+            cache=SQLiteCache(database_path=str(QUERY_ENHANCEMENT_LLM_CACHE_PATH))
         )
 
+        # Prompt → LLM → string chains, built once (prompts are parsed at import)
+        self._hyde_chain = hyde_prompt | self.llm | StrOutputParser()
+        self._multi_query_chain = multi_query_prompt | self.llm | StrOutputParser()
+        self._expansion_chain = query_expansion_prompt | self.llm | StrOutputParser()
+
+        # (technique, query, ...) -> output, shared by sync and async callers
+        self._results = BoundedCache(maxsize=QUERY_ENHANCEMENT_CACHE_SIZE)
+
     def hyde(self, query: str) -> str:
         """
         HyDE: Hypothetical Document Embeddings.
@@ -58,20 +89,23 @@ class QueryEnhancer:
         Returns:
             Hypothetical answer
         """
-        hyde_prompt = ChatPromptTemplate.from_template(
-            """You are a movie and TV show expert.
-
-Given the user's question, write a hypothetical answer that would appear in our database.
-Include specific movie/show titles, genres, actors, and descriptions.
-
-User Question: {query}
-
-Hypothetical Answer (2-3 sentences):"""
+        chain = self._hyde_chain
+        hypothetical_answer = self._results.get_or_set(
+            ("hyde", query), lambda: chain.invoke({"query": query})
         )
 
-        chain = hyde_prompt | self.llm | StrOutputParser()
-        hypothetical_answer = chain.invoke({"query": query})
+        return hypothetical_answer
+
+    async def ahyde(self, query: str) -> str:
+        """Async version of `hyde`."""
+        key = ("hyde", query)
+        cached = self._results.get(key)
+        if cached is not None:
+            return cached
 
+        chain = self._hyde_chain
+        hypothetical_answer = await throttled(lambda: chain.ainvoke({"query": query}))
+        self._results.set(key, hypothetical_answer)
         return hypothetical_answer
 
     def multi_query(self, query: str, num_variations: int = 3) -> List[str]:
@@ -102,25 +136,45 @@ Hypothetical Answer (2-3 sentences):"""
         Returns:
             List of query variations (including original)
         """
-        multi_query_prompt = ChatPromptTemplate.from_template(
-            """You are a helpful assistant that generates multiple variations of a question.
-
-Generate {num_variations} different ways to ask the same question about movies/TV shows.
-Each variation should emphasize different aspects or use different terminology.
-
-Original Question: {query}
-
-Variations (one per line):"""
+        chain = self._multi_query_chain
+        result = self._results.get_or_set(
+            ("multi_query", query, num_variations),
+            lambda: chain.invoke({"query": query, "num_variations": num_variations})
         )
 
-        chain = multi_query_prompt | self.llm | StrOutputParser()
-        result = chain.invoke({"query": query, "num_variations": num_variations})
+        return self._parse_variations(query, result, num_variations)
+
+    async def amulti_query(self, query: str, num_variations: int = 3) -> List[str]:
+        """Async version of `multi_query`."""
+        key = ("multi_query", query, num_variations)
+        result = self._results.get(key)
+        if result is None:
+            chain = self._multi_query_chain
+            result = await throttled(
+                lambda: chain.ainvoke({"query": query, "num_variations": num_variations})
+            )
+            self._results.set(key, result)
+        return self._parse_variations(query, result, num_variations)
+
+    @staticmethod
+    def _parse_variations(query: str, result: str, num_variations: int) -> List[str]:
+        """
+        Turn the LLM output into the original query plus its variations.
 
-        # Parse variations (assuming one per line)
-        variations = [line.strip() for line in result.split('\n') if line.strip()]
+        List markers and quotes are stripped and repeats of the original (or
+        of each other) dropped, since every query left here costs an embedding
+        and a vector search.
+        """
+        all_queries = [query]
+        seen = {query.strip().casefold()}
 
-        # Add original query
-        all_queries = [query] + variations
+        # Parse variations (assuming one per line)
+        for line in result.split('\n'):
+            variation = _LIST_MARKER_RE.sub("", line.strip()).strip().strip('"\'')
+            key = variation.casefold()
+            if variation and key not in seen:
+                seen.add(key)
+                all_queries.append(variation)
 
         return all_queries[:num_variations + 1]  # Ensure we don't exceed limit
 
@@ -148,18 +202,21 @@ Variations (one per line):"""
         Returns:
             Expanded query with synonyms
         """
-        expansion_prompt = ChatPromptTemplate.from_template(
-            """You are a query expansion expert for movie/TV databases.
-
-Given a search query, add relevant synonyms and related terms.
-Include genre names, similar concepts, and alternative terminology.
-
-Original Query: {query}
-
-Expanded Query (add 3-5 related terms):"""
+        chain = self._expansion_chain
+        expanded = self._results.get_or_set(
+            ("expansion", query), lambda: chain.invoke({"query": query})
         )
 
-        chain = expansion_prompt | self.llm | StrOutputParser()
-        expanded = chain.invoke({"query": query})
+        return expanded
+
+    async def aexpand_query(self, query: str) -> str:
+        """Async version of `expand_query`."""
+        key = ("expansion", query)
+        cached = self._results.get(key)
+        if cached is not None:
+            return cached
 
+        chain = self._expansion_chain
+        expanded = await throttled(lambda: chain.ainvoke({"query": query}))
+        self._results.set(key, expanded)
         return expanded
@@ -0,0 +1,207 @@
+"""
+Semantic Cache for LLM calls.
+
+Rephrased questions ("recommend sci-fi with Keanu" vs "Keanu sci-fi movies")
+usually retrieve the same documents and deserve the same answer/score.
+Instead of an exact string match, entries are looked up by:
+1. Guard - exact hash of the inputs that must match (call kind + context)
+2. Question embedding - cosine similarity >= threshold
+
+Candidates are found with random-projection LSH (several hash tables of
+hyperplane sign bits), so a lookup compares against a few bucketed entries
+instead of scanning every cached question.
+
+Entries expire after a TTL and the least recently used are evicted first.
+Vectors are stored as int8 with a per-vector scale (4x smaller than float32);
+cosine similarity error from the quantization is well below the hit threshold
+margin.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.config import (
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_TTL_SECONDS,
+    SEMANTIC_CACHE_MAX_ENTRIES,
+    SEMANTIC_CACHE_LSH_TABLES,
+    SEMANTIC_CACHE_LSH_BITS
+)
+
+
+def make_guard(kind: str, *parts: str) -> str:
+    """
+    Build the exact-match part of a cache key.
+
+    Args:
+        kind: Call type (e.g. "answer", "score", "verify")
+        parts: Inputs besides the question that determine the result
+
+    Returns:
+        Short hex digest prefixed with the kind
+    """
+    digest = hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16)
+    return f"{kind}:{digest.hexdigest()}"
+
+
+@dataclass
+class _Entry:
+    guard: str
+    vector: np.ndarray  # int8-quantized unit-normalized question embedding
+    scale: float  # vector ≈ quantized * scale
+    signature: Tuple[int, ...]  # LSH bucket code per table
+    value: Any
+    created: float
+
+
+class SemanticCache:
+    """
+    In-process semantic cache (cosine similarity over question embeddings).
+
+    Thread-safe; shared by sync and async callers.
+    """
+
+    def __init__(
+        self,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        ttl_seconds: float = SEMANTIC_CACHE_TTL_SECONDS,
+        max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES,
+        lsh_tables: int = SEMANTIC_CACHE_LSH_TABLES,
+        lsh_bits: int = SEMANTIC_CACHE_LSH_BITS
+    ):
+        """
+        Args:
+            threshold: Minimum cosine similarity for a hit
+            ttl_seconds: Entry lifetime
+            max_entries: LRU capacity
+            lsh_tables: Number of LSH hash tables
+            lsh_bits: Hyperplanes (bits) per hash table
+        """
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.lsh_tables = lsh_tables
+        self.lsh_bits = lsh_bits
+
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        # (table, guard, code) -> entry ids
+        self._buckets: Dict[Tuple[int, str, int], Set[int]] = {}
+        self._planes: Optional[np.ndarray] = None  # Created on first use (dimension unknown until then)
+        self._bit_weights = 1 << np.arange(lsh_bits)
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(vector: List[float]) -> np.ndarray:
+        """Return the embedding as a float32 unit vector."""
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+
+    @staticmethod
+    def _quantize(array: np.ndarray) -> Tuple[np.ndarray, float]:
+        """Scale-quantize a unit vector to int8; returns (int8 vector, scale)."""
+        peak = float(np.max(np.abs(array))) if array.size else 0.0
+        if not peak:
+            return np.zeros(array.shape, dtype=np.int8), 0.0
+
+        scale = peak / 127.0
+        return np.round(array / scale).astype(np.int8), scale
+
+    def _signature(self, array: np.ndarray) -> Tuple[int, ...]:
+        """LSH bucket code per table: sign bits of random hyperplane projections (caller holds the lock)."""
+        if self._planes is None:
+            rng = np.random.default_rng(0)
+            self._planes = rng.standard_normal(
+                (self.lsh_tables * self.lsh_bits, array.shape[0])
+            ).astype(np.float32)
+
+        bits = (self._planes @ array > 0).reshape(self.lsh_tables, self.lsh_bits)
+        return tuple(int(code) for code in bits @ self._bit_weights)
+
+    def check(self, vector: List[float], guard: str) -> Optional[Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            vector: Question embedding
+            guard: Exact-match key from `make_guard`
+
+        Returns:
+            Cached value, or None on a miss
+        """
+        array = self._normalize(vector)
+        query, query_scale = self._quantize(array)
+        now = time.time()
+
+        with self._lock:
+            # Entries sharing a bucket with the query in any table
+            bucketed = set().union(*(
+                self._buckets.get((table, guard, code), ())
+                for table, code in enumerate(self._signature(array))
+            ))
+
+            candidates = []
+            for entry_id in bucketed:
+                entry = self._entries[entry_id]
+                if now - entry.created > self.ttl_seconds:
+                    self._remove(entry_id)
+                else:
+                    candidates.append(entry_id)
+
+            if not candidates:
+                return None
+
+            # Integer dot products (int32 accumulator - int16 would overflow at 1536 dims)
+            matrix = np.stack([self._entries[i].vector for i in candidates]).astype(np.int32)
+            scales = np.array([self._entries[i].scale for i in candidates], dtype=np.float32)
+            similarities = (matrix @ query.astype(np.int32)) * scales * query_scale
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+
+            entry_id = candidates[best]
+            self._entries.move_to_end(entry_id)
+            return self._entries[entry_id].value
+
+    def store(self, vector: List[float], guard: str, value: Any) -> None:
+        """
+        Cache a value under (guard, question embedding).
+
+        Args:
+            vector: Question embedding
+            guard: Exact-match key from `make_guard`
+            value: Result to cache
+        """
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+
+            array = self._normalize(vector)
+            quantized, scale = self._quantize(array)
+            signature = self._signature(array)
+            self._entries[entry_id] = _Entry(guard, quantized, scale, signature, value, time.time())
+            for table, code in enumerate(signature):
+                self._buckets.setdefault((table, guard, code), set()).add(entry_id)
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, entry_id: int) -> None:
+        """Drop an entry (caller holds the lock)."""
+        entry = self._entries.pop(entry_id)
+        for table, code in enumerate(entry.signature):
+            key = (table, entry.guard, code)
+            ids = self._buckets[key]
+            ids.discard(entry_id)
+            if not ids:
+                del self._buckets[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
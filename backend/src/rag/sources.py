@@ -0,0 +1,54 @@
+"""
+Source attribution for RAG responses.
+
+Every pipeline returns the documents it used as `Source` records; they
+are converted to plain dicts only at the JSON boundary (`to_dict`).
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List
+
+from langchain_core.documents import Document
+
+
+@dataclass(slots=True)
+class Source:
+    """Where part of an answer came from."""
+    title: str
+    source: str
+    genre: str
+    rating: str
+
+    def to_dict(self) -> Dict[str, str]:
+        """Plain dict for JSON responses."""
+        return {
+            "title": self.title,
+            "source": self.source,
+            "genre": self.genre,
+            "rating": self.rating
+        }
+
+
+def doc_to_source(doc: Document, missing: str = "Unknown") -> Source:
+    """
+    Build a Source from a retrieved document's metadata.
+
+    Args:
+        doc: Retrieved document
+        missing: Placeholder for a missing genre/rating
+
+    Returns:
+        Source record
+    """
+    metadata = doc.metadata
+    return Source(
+        title=metadata.get('title', 'Unknown'),
+        source=metadata.get('source', 'Unknown'),
+        genre=metadata.get('genre', missing),
+        rating=metadata.get('rating', missing)
+    )
+
+
+def sources_to_dicts(sources: List[Source]) -> List[Dict[str, str]]:
+    """Serialize a list of sources for a JSON response."""
+    return [source.to_dict() for source in sources]
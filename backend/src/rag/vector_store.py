@@ -5,11 +5,40 @@ What this does:
 1. Creates a Pinecone index (if not exists)
 2. Manages index configuration (dimension, metric, cloud)
 3. Provides utilities for index operations
+4. Batched similarity search for several queries at once
+5. Shared gRPC index handle for the query and upload hot paths
 """
 
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
 from pinecone import Pinecone, ServerlessSpec
-from src.config import PINECONE_API_KEY, PINECONE_INDEX_NAME, PINECONE_DIMENSION
+from pinecone.exceptions import NotFoundException
+from pinecone.grpc import PineconeGRPC
+from src.config import (
+    PINECONE_API_KEY,
+    PINECONE_INDEX_NAME,
+    PINECONE_DIMENSION,
+    PINECONE_METRIC,
+    UPLOAD_MARKER_NAMESPACE
+)
+
+_UPLOAD_MARKER_ID = "dataset-fingerprint"
+
+
+@lru_cache(maxsize=None)
+def get_grpc_index():
+    """
+    Process-wide gRPC handle to the index.
+
+    gRPC multiplexes requests over one HTTP/2 channel with protobuf
+    payloads, so queries and (async) upserts skip the per-request REST
+    overhead. Control-plane calls (create/describe/delete) stay on REST.
+    """
+    return PineconeGRPC(api_key=PINECONE_API_KEY).Index(PINECONE_INDEX_NAME)
 
 
 class PineconeVectorStore:
@@ -19,7 +48,7 @@ class PineconeVectorStore:
     Best Practices:
     1. Check if index exists before creating
     2. Use serverless spec for cost-efficiency
-    3. Choose cosine similarity for text embeddings
+    3. Unit-normalize vectors and use dot product (same ranking as cosine, no per-query norm math)
     4. Wait for index to be ready before using
     """
 
@@ -27,6 +56,7 @@ class PineconeVectorStore:
         """Initialize Pinecone client."""
         self.pc = Pinecone(api_key=PINECONE_API_KEY)
         self.index_name = PINECONE_INDEX_NAME
+        self._index = None  # Resolved once by get_index
 
     def create_index(self):
         """
@@ -34,15 +64,16 @@ class PineconeVectorStore:
 
         Index Configuration:
         - Dimension: 1536 (text-embedding-3-small size)
-        - Metric: cosine (best for text similarity)
+        - Metric: dotproduct (vectors are L2-normalized at upload, so this is cosine)
         - Cloud: AWS, Region: us-east-1 (free tier)
         """
-        # Check if index already exists
-        existing_indexes = [idx.name for idx in self.pc.list_indexes()]
-
-        if self.index_name in existing_indexes:
+        # Check if index already exists (one describe call, not a list of every index)
+        try:
+            self.pc.describe_index(self.index_name)
             print(f"✅ Index '{self.index_name}' already exists")
-            return self.pc.Index(self.index_name)
+            return self.get_index()
+        except NotFoundException:
+            pass
 
         print(f"🔨 Creating index '{self.index_name}'...")
 
@@ -50,7 +81,7 @@ class PineconeVectorStore:
         self.pc.create_index(
             name=self.index_name,
             dimension=PINECONE_DIMENSION,
-            metric="cosine",  # Best for text embeddings
+            metric=PINECONE_METRIC,
             spec=ServerlessSpec(
                 cloud="aws",
                 region="us-east-1"  # Free tier region
@@ -59,24 +90,57 @@ class PineconeVectorStore:
 
         # Wait for index to be ready
         print("⏳ Waiting for index to be ready...")
+        # Exponential backoff: notice readiness quickly without hammering describe_index
+        delay = 0.1
         while not self.pc.describe_index(self.index_name).status.ready:
-            time.sleep(1)
+            time.sleep(delay)
+            delay = min(delay * 1.6, 2.0)
 
         print(f"✅ Index '{self.index_name}' created successfully!")
-        return self.pc.Index(self.index_name)
+        return self.get_index()
 
     def get_index(self):
-        """Get existing index."""
-        return self.pc.Index(self.index_name)
+        """Get existing index (handle is created once and reused)."""
+        if self._index is None:
+            self._index = self.pc.Index(self.index_name)
+        return self._index
 
     def delete_index(self):
         """Delete the index (use carefully!)."""
-        if self.index_name in [idx.name for idx in self.pc.list_indexes()]:
+        try:
             self.pc.delete_index(self.index_name)
+            self._index = None
             print(f"🗑️  Index '{self.index_name}' deleted")
-        else:
+        except NotFoundException:
             print(f"❌ Index '{self.index_name}' does not exist")
 
+    def get_upload_marker(self) -> Tuple[Optional[str], int]:
+        """
+        Fingerprint of the last completed upload and the document vector count.
+
+        Returns:
+            (stored fingerprint or None, vectors outside the marker namespace)
+        """
+        index = self.get_index()
+        stats = index.describe_index_stats()
+        marker_ns = stats.namespaces.get(UPLOAD_MARKER_NAMESPACE)
+        document_count = stats.total_vector_count - (marker_ns.vector_count if marker_ns else 0)
+        if not marker_ns:
+            return None, document_count
+
+        fetched = index.fetch(ids=[_UPLOAD_MARKER_ID], namespace=UPLOAD_MARKER_NAMESPACE)
+        marker = fetched.vectors.get(_UPLOAD_MARKER_ID)
+        return (marker.metadata or {}).get("fingerprint") if marker else None, document_count
+
+    def set_upload_marker(self, fingerprint: str) -> None:
+        """Record the fingerprint of a completed upload (in its own namespace, never searched)."""
+        # Dense vectors can't be all zeros; the values are never queried
+        placeholder = [1.0] + [0.0] * (PINECONE_DIMENSION - 1)
+        self.get_index().upsert(
+            vectors=[(_UPLOAD_MARKER_ID, placeholder, {"fingerprint": fingerprint})],
+            namespace=UPLOAD_MARKER_NAMESPACE
+        )
+
     def get_index_stats(self):
         """Get index statistics."""
         index = self.get_index()
@@ -85,3 +149,30 @@ class PineconeVectorStore:
         print(f"  Total vectors: {stats.total_vector_count}")
         print(f"  Dimension: {stats.dimension}")
         return stats
+
+
+def batch_similarity_search(
+    vector_store: VectorStore,
+    queries: List[str],
+    k: int,
+    max_workers: int = 4
+) -> List[List[Document]]:
+    """
+    Similarity search for several queries: one batched embedding call, then
+    the per-query index lookups run concurrently.
+
+    Args:
+        vector_store: LangChain vector store (e.g. langchain_pinecone's PineconeVectorStore)
+        queries: Search queries
+        k: Results per query
+        max_workers: Concurrent index queries
+
+    Returns:
+        One result list per query, in query order
+    """
+    if not queries:
+        return []
+
+    vectors = vector_store.embeddings.embed_documents(queries)
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(vectors))) as pool:
+        return list(pool.map(lambda vector: vector_store.similarity_search_by_vector(vector, k=k), vectors))
@@ -0,0 +1,40 @@
+"""
+Run async pipeline code from synchronous callers.
+
+The shared httpx AsyncClient (and the OpenAI semaphore) must stay on one
+event loop, so `asyncio.run` - which creates and closes a fresh loop per
+call - can't be used. Sync wrappers submit their coroutine to a single
+long-lived background loop instead.
+"""
+
+import asyncio
+import threading
+from typing import Awaitable, Optional, TypeVar
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Start (once) and return the process-wide background event loop."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever,
+                name="rag-async-loop",
+                daemon=True
+            ).start()
+    return _loop
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """
+    Block until `coro` completes on the background loop and return its result.
+
+    Must not be called from a coroutine (await the async method instead).
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
@@ -0,0 +1,68 @@
+"""
+Small in-process caches.
+
+A bounded, thread-safe LRU mapping for values that are cheap to key but
+worth not recomputing (e.g. formatted RAG context strings).
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class BoundedCache:
+    """
+    Thread-safe LRU cache holding at most `maxsize` entries.
+
+    Args:
+        maxsize: Maximum number of entries before the least recently used is evicted
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for `key` (marking it recently used), or `default`."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key]
+        return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store `value` under `key`, evicting the least recently used entry if full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for `key`, computing it with `factory` on a miss.
+
+        Args:
+            key: Hashable cache key
+            factory: Zero-argument callable producing the value
+
+        Returns:
+            Cached or freshly computed value
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key]
+
+        value = factory()
+        self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -3,11 +3,23 @@ Document Loader for CSV datasets.
 Loads movie/TV show data and converts to LangChain Documents.
 """
 
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterator, List, Tuple
 from langchain_core.documents import Document
 
+# Cells read as missing (pandas' read_csv defaults), so documents match what
+# pandas parsing produced
+_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a",
+    "nan", "null"
+]
+
 
 class MovieDocumentLoader:
     """
@@ -20,6 +32,23 @@ class MovieDocumentLoader:
     4. Normalize text (strip whitespace, handle nulls)
     """
 
+    # Columns each dataset's documents are built from (the rest are never parsed)
+    NETFLIX_COLUMNS = [
+        'show_id', 'title', 'type', 'description', 'director', 'cast',
+        'country', 'listed_in', 'release_year', 'rating', 'duration'
+    ]
+    TV_SHOWS_COLUMNS = [
+        'id', 'title', 'original_title', 'overview', 'genre', 'country_origin',
+        'original_language', 'premiere_date', 'popularity', 'rating', 'votes'
+    ]
+    IMDB_MOVIES_COLUMNS = [
+        'Name', 'Year', 'Duration', 'Genre', 'Rating', 'Votes', 'Director',
+        'Actor 1', 'Actor 2', 'Actor 3'
+    ]
+    NEW_IMDB_COLUMNS = [
+        'title', 'year', 'duration', 'genre', 'rating', 'description', 'stars', 'votes'
+    ]
+
     def __init__(self, csv_path: Path):
         """
         Initialize the document loader.
@@ -29,6 +58,59 @@ class MovieDocumentLoader:
         """
         self.csv_path = csv_path
 
+    @staticmethod
+    def _csv_options(usecols: List[str]) -> Dict:
+        """
+        pyarrow.csv options shared by `_read_csv` and `_iter_csv`.
+
+        Every column is read as text: no type inference, and values reach the
+        documents exactly as written (e.g. a year column with gaps stays "2019",
+        not "2019.0").
+        """
+        return {
+            "read_options": pacsv.ReadOptions(use_threads=True, block_size=1 << 20),
+            # Descriptions can hold quoted line breaks
+            "parse_options": pacsv.ParseOptions(newlines_in_values=True),
+            "convert_options": pacsv.ConvertOptions(
+                include_columns=usecols,
+                column_types={column: pa.string() for column in usecols},
+                null_values=_NA_VALUES,
+                strings_can_be_null=True
+            ),
+        }
+
+    def _read_csv(self, usecols: List[str]) -> pd.DataFrame:
+        """
+        Read the whole CSV with pyarrow's multithreaded C++ parser.
+
+        Args:
+            usecols: Columns to parse (unused columns are skipped entirely)
+        """
+        return pacsv.read_csv(self.csv_path, **self._csv_options(usecols)).to_pandas()
+
+    def _iter_csv(self, usecols: List[str], chunksize: int) -> Iterator[pd.DataFrame]:
+        """
+        Stream the CSV `chunksize` rows at a time (same options as `_read_csv`).
+
+        pyarrow's streaming reader yields ~1 MB record batches; they are
+        regrouped here into frames of exactly `chunksize` rows (the last may
+        be shorter).
+        """
+        reader = pacsv.open_csv(self.csv_path, **self._csv_options(usecols))
+        pending, pending_rows = [], 0
+
+        for batch in reader:
+            pending.append(batch)
+            pending_rows += batch.num_rows
+            while pending_rows >= chunksize:
+                table = pa.Table.from_batches(pending)
+                yield table.slice(0, chunksize).to_pandas()
+                rest = table.slice(chunksize)
+                pending, pending_rows = rest.to_batches(), rest.num_rows
+
+        if pending_rows:
+            yield pa.Table.from_batches(pending).to_pandas()
+
     def load_netflix_data(self) -> List[Document]:
         """
         Load Netflix movies and TV shows dataset.
@@ -36,42 +118,50 @@ class MovieDocumentLoader:
         Returns:
             List of LangChain Document objects
         """
-        df = pd.read_csv(self.csv_path)
+        return self._to_documents(*self._netflix_columns(self._read_csv(self.NETFLIX_COLUMNS)))
 
+    def load_netflix_raw(self) -> Tuple[List[str], List[Dict]]:
+        """
+        Load Netflix movies and TV shows dataset without building Documents.
+
+        Returns:
+            (page_content strings, metadata dicts), aligned by row
+        """
+        return self._to_raw(*self._netflix_columns(self._read_csv(self.NETFLIX_COLUMNS)))
+
+    @staticmethod
+    def _netflix_columns(df: pd.DataFrame) -> Tuple[pd.Series, pd.DataFrame]:
+        """Build content and metadata columns for every row at once."""
         # Handle missing values
         df = df.fillna("")
-
-        documents = []
-
-        for idx, row in df.iterrows():
-            # Combine multiple columns for rich context
-            # This gives the LLM more information to retrieve from
-            content = f"""
-Title: {row['title']}
-Type: {row['type']}
-Description: {row['description']}
-Director: {row['director']}
-Cast: {row['cast']}
-Country: {row['country']}
-Listed In: {row['listed_in']}
-            """.strip()
-
-            # Metadata helps with filtering and provides context
-            metadata = {
-                "source": "netflix",
-                "show_id": row['show_id'],
-                "title": row['title'],
-                "type": row['type'],
-                "release_year": str(row['release_year']),
-                "rating": row['rating'],
-                "duration": row['duration'],
-                "genre": row['listed_in'],
-                "country": row['country'],
-            }
-
-            documents.append(Document(page_content=content, metadata=metadata))
-
-        return documents
+        text = df.astype(str)
+
+        # Combine multiple columns for rich context
+        # This gives the LLM more information to retrieve from
+        content = (
+            "Title: " + text['title']
+            + "\nType: " + text['type']
+            + "\nDescription: " + text['description']
+            + "\nDirector: " + text['director']
+            + "\nCast: " + text['cast']
+            + "\nCountry: " + text['country']
+            + "\nListed In: " + text['listed_in']
+        )
+
+        # Metadata helps with filtering and provides context
+        metadata = pd.DataFrame({
+            "source": "netflix",
+            "show_id": df['show_id'],
+            "title": df['title'],
+            "type": df['type'],
+            "release_year": text['release_year'],
+            "rating": df['rating'],
+            "duration": df['duration'],
+            "genre": df['listed_in'],
+            "country": df['country'],
+        })
+
+        return content, metadata
 
     def load_tv_shows_data(self) -> List[Document]:
         """
@@ -80,41 +170,49 @@ Listed In: {row['listed_in']}
         Returns:
             List of LangChain Document objects
         """
-        df = pd.read_csv(self.csv_path)
+        return self._to_documents(*self._tv_shows_columns(self._read_csv(self.TV_SHOWS_COLUMNS)))
+
+    def load_tv_shows_raw(self) -> Tuple[List[str], List[Dict]]:
+        """
+        Load top-rated TV shows dataset without building Documents.
+
+        Returns:
+            (page_content strings, metadata dicts), aligned by row
+        """
+        return self._to_raw(*self._tv_shows_columns(self._read_csv(self.TV_SHOWS_COLUMNS)))
 
+    @staticmethod
+    def _tv_shows_columns(df: pd.DataFrame) -> Tuple[pd.Series, pd.DataFrame]:
+        """Build content and metadata columns for every row at once."""
         # Handle missing values
         df = df.fillna("")
-
-        documents = []
-
-        for idx, row in df.iterrows():
-            # Combine relevant columns
-            content = f"""
-Title: {row['title']}
-Original Title: {row['original_title']}
-Overview: {row['overview']}
-Genre: {row['genre']}
-Country: {row['country_origin']}
-Language: {row['original_language']}
-            """.strip()
-
-            # Rich metadata for filtering
-            metadata = {
-                "source": "tv_shows",
-                "show_id": str(row['id']),
-                "title": row['title'],
-                "premiere_date": str(row['premiere_date']),
-                "popularity": str(row['popularity']),
-                "genre": row['genre'],
-                "country": row['country_origin'],
-                "language": row['original_language'],
-                "rating": str(row['rating']),
-                "votes": str(row['votes']),
-            }
-
-            documents.append(Document(page_content=content, metadata=metadata))
-
-        return documents
+        text = df.astype(str)
+
+        # Combine relevant columns
+        content = (
+            "Title: " + text['title']
+            + "\nOriginal Title: " + text['original_title']
+            + "\nOverview: " + text['overview']
+            + "\nGenre: " + text['genre']
+            + "\nCountry: " + text['country_origin']
+            + "\nLanguage: " + text['original_language']
+        )
+
+        # Rich metadata for filtering
+        metadata = pd.DataFrame({
+            "source": "tv_shows",
+            "show_id": text['id'],
+            "title": df['title'],
+            "premiere_date": text['premiere_date'],
+            "popularity": text['popularity'],
+            "genre": df['genre'],
+            "country": df['country_origin'],
+            "language": df['original_language'],
+            "rating": text['rating'],
+            "votes": text['votes'],
+        })
+
+        return content, metadata
 
     def load_imdb_movies_data(self) -> List[Document]:
         """
@@ -123,40 +221,48 @@ Language: {row['original_language']}
         Returns:
             List of LangChain Document objects
         """
-        df = pd.read_csv(self.csv_path)
+        return self._to_documents(*self._imdb_movies_columns(self._read_csv(self.IMDB_MOVIES_COLUMNS)))
+
+    def load_imdb_movies_raw(self) -> Tuple[List[str], List[Dict]]:
+        """
+        Load IMDB Indian movies dataset without building Documents.
+
+        Returns:
+            (page_content strings, metadata dicts), aligned by row
+        """
+        return self._to_raw(*self._imdb_movies_columns(self._read_csv(self.IMDB_MOVIES_COLUMNS)))
 
+    @staticmethod
+    def _imdb_movies_columns(df: pd.DataFrame) -> Tuple[pd.Series, pd.DataFrame]:
+        """Build content and metadata columns for every row at once."""
         # Handle missing values
         df = df.fillna("")
-
-        documents = []
-
-        for idx, row in df.iterrows():
-            # Combine relevant columns
-            content = f"""
-Title: {row['Name']}
-Year: {row['Year']}
-Duration: {row['Duration']} minutes
-Genre: {row['Genre']}
-Rating: {row['Rating']}
-Director: {row['Director']}
-Cast: {row['Actor 1']}, {row['Actor 2']}, {row['Actor 3']}
-            """.strip()
-
-            # Rich metadata for filtering
-            metadata = {
-                "source": "imdb_indian",
-                "title": row['Name'],
-                "year": str(row['Year']),
-                "duration": str(row['Duration']),
-                "genre": row['Genre'],
-                "rating": str(row['Rating']),
-                "votes": str(row['Votes']),
-                "director": row['Director'],
-            }
-
-            documents.append(Document(page_content=content, metadata=metadata))
-
-        return documents
+        text = df.astype(str)
+
+        # Combine relevant columns
+        content = (
+            "Title: " + text['Name']
+            + "\nYear: " + text['Year']
+            + "\nDuration: " + text['Duration'] + " minutes"
+            + "\nGenre: " + text['Genre']
+            + "\nRating: " + text['Rating']
+            + "\nDirector: " + text['Director']
+            + "\nCast: " + text['Actor 1'] + ", " + text['Actor 2'] + ", " + text['Actor 3']
+        )
+
+        # Rich metadata for filtering
+        metadata = pd.DataFrame({
+            "source": "imdb_indian",
+            "title": df['Name'],
+            "year": text['Year'],
+            "duration": text['Duration'],
+            "genre": df['Genre'],
+            "rating": text['Rating'],
+            "votes": text['Votes'],
+            "director": df['Director'],
+        })
+
+        return content, metadata
 
     def load_new_imdb_data(self) -> List[Document]:
         """
@@ -165,42 +271,85 @@ Cast: {row['Actor 1']}, {row['Actor 2']}, {row['Actor 3']}
         Returns:
             List of LangChain Document objects
         """
-        df = pd.read_csv(self.csv_path)
+        df = self._read_csv(self.NEW_IMDB_COLUMNS)
+
+        return self._new_imdb_documents(df)
+
+    def iter_new_imdb_data(self, chunksize: int = 1000) -> Iterator[List[Document]]:
+        """
+        Stream the new IMDB movies dataset (IMBD.csv) in batches.
 
+        Only one chunk of rows is parsed and held in memory at a time, so
+        ingestion memory stays bounded by the batch size, not the CSV size.
+
+        Args:
+            chunksize: Number of CSV rows (documents) per batch
+
+        Yields:
+            Lists of at most `chunksize` LangChain Document objects
+        """
+        for df in self._iter_csv(self.NEW_IMDB_COLUMNS, chunksize):
+            yield self._new_imdb_documents(df)
+
+    @classmethod
+    def _new_imdb_documents(cls, df: pd.DataFrame) -> List[Document]:
+        """Convert IMBD.csv rows to Documents."""
         # Handle missing values
         df = df.fillna("")
+        text = df.astype(str)
+
+        # Combine relevant columns
+        content = (
+            "Title: " + text['title']
+            + "\nYear: " + text['year']
+            + "\nDuration: " + text['duration']
+            + "\nGenre: " + text['genre']
+            + "\nRating: " + text['rating']
+            + "\nDescription: " + text['description']
+            + "\nStars: " + text['stars']
+            + "\nVotes: " + text['votes']
+        )
+
+        # Rich metadata for filtering
+        metadata = pd.DataFrame({
+            "source": "new_imdb", # Differentiate from existing IMDB
+            "title": df['title'],
+            "year": text['year'],
+            "duration": df['duration'],
+            "genre": df['genre'],
+            "rating": text['rating'],
+            "votes": df['votes'],
+            "description": df['description'],
+            "stars": df['stars'],
+        })
+
+        return cls._to_documents(content, metadata)
+
+    @staticmethod
+    def _to_raw(content: pd.Series, metadata: pd.DataFrame) -> Tuple[List[str], List[Dict]]:
+        """Per-row content strings and metadata dicts, without wrapping them in Documents."""
+        return content.str.strip().tolist(), metadata.to_dict(orient="records")
+
+    @staticmethod
+    def _to_documents(content: pd.Series, metadata: pd.DataFrame) -> List[Document]:
+        """
+        Pair per-row content strings with per-row metadata dicts.
+
+        Content and metadata are built column-wise for the whole frame, so
+        no pandas object is created per row (unlike df.iterrows()).
+
+        Args:
+            content: One page_content string per row
+            metadata: One metadata column per field
 
-        documents = []
-
-        for idx, row in df.iterrows():
-            # Combine relevant columns
-            content = f"""
-Title: {row['title']}
-Year: {row['year']}
-Duration: {row['duration']}
-Genre: {row['genre']}
-Rating: {row['rating']}
-Description: {row['description']}
-Stars: {row['stars']}
-Votes: {row['votes']}
-            """.strip()
-
-            # Rich metadata for filtering
-            metadata = {
-                "source": "new_imdb", # Differentiate from existing IMDB
-                "title": row['title'],
-                "year": str(row['year']),
-                "duration": row['duration'],
-                "genre": row['genre'],
-                "rating": str(row['rating']),
-                "votes": row['votes'],
-                "description": row['description'],
-                "stars": row['stars'],
-            }
-
-            documents.append(Document(page_content=content, metadata=metadata))
-
-        return documents
+        Returns:
+            List of LangChain Document objects
+        """
+        texts, metadatas = MovieDocumentLoader._to_raw(content, metadata)
+        return [
+            Document(page_content=page_content, metadata=row_metadata)
+            for page_content, row_metadata in zip(texts, metadatas)
+        ]
 
     @staticmethod
     def load_all_datasets(netflix_path: Path, tv_shows_path: Path, imdb_path: Path) -> List[Document]:
@@ -217,24 +366,128 @@ Votes: {row['votes']}
         """
         all_documents = []
 
-        # Load Netflix data
-        netflix_loader = MovieDocumentLoader(netflix_path)
-        netflix_docs = netflix_loader.load_netflix_data()
-        all_documents.extend(netflix_docs)
-        print(f"✅ Loaded {len(netflix_docs)} Netflix documents")
+        # Each loader is CPU-bound pandas work and independent of the others,
+        # so parse the three CSVs in separate processes (wall time ~ slowest one)
+        with ProcessPoolExecutor(max_workers=3) as executor:
+            netflix_future = executor.submit(MovieDocumentLoader(netflix_path).load_netflix_data)
+            tv_future = executor.submit(MovieDocumentLoader(tv_shows_path).load_tv_shows_data)
+            imdb_future = executor.submit(MovieDocumentLoader(imdb_path).load_imdb_movies_data)
+
+            # Load Netflix data
+            netflix_docs = netflix_future.result()
+            all_documents.extend(netflix_docs)
+            print(f"✅ Loaded {len(netflix_docs)} Netflix documents")
 
-        # Load TV shows data
-        tv_loader = MovieDocumentLoader(tv_shows_path)
-        tv_docs = tv_loader.load_tv_shows_data()
-        all_documents.extend(tv_docs)
-        print(f"✅ Loaded {len(tv_docs)} TV show documents")
+            # Load TV shows data
+            tv_docs = tv_future.result()
+            all_documents.extend(tv_docs)
+            print(f"✅ Loaded {len(tv_docs)} TV show documents")
 
-        # Load IMDB Indian movies data
-        imdb_loader = MovieDocumentLoader(imdb_path)
-        imdb_docs = imdb_loader.load_imdb_movies_data()
-        all_documents.extend(imdb_docs)
-        print(f"✅ Loaded {len(imdb_docs)} IMDB Indian movie documents")
+            # Load IMDB Indian movies data
+            imdb_docs = imdb_future.result()
+            all_documents.extend(imdb_docs)
+            print(f"✅ Loaded {len(imdb_docs)} IMDB Indian movie documents")
 
         print(f"📊 Total documents: {len(all_documents)}")
 
         return all_documents
+
+    @staticmethod
+    def load_all_raw(
+        netflix_path: Path,
+        tv_shows_path: Path,
+        imdb_path: Path
+    ) -> Tuple[List[str], List[Dict]]:
+        """
+        Load all datasets as plain texts and metadata dicts.
+
+        Same data as `load_all_datasets`, for the upload path, which only
+        needs (text, metadata) pairs and skips building Document objects.
+
+        Args:
+            netflix_path: Path to Netflix CSV
+            tv_shows_path: Path to TV shows CSV
+            imdb_path: Path to IMDB movies CSV
+
+        Returns:
+            (page_content strings, metadata dicts), aligned by row
+        """
+        texts, metadatas = [], []
+
+        with ProcessPoolExecutor(max_workers=3) as executor:
+            futures = [
+                ("Netflix", executor.submit(MovieDocumentLoader(netflix_path).load_netflix_raw)),
+                ("TV show", executor.submit(MovieDocumentLoader(tv_shows_path).load_tv_shows_raw)),
+                ("IMDB Indian movie", executor.submit(MovieDocumentLoader(imdb_path).load_imdb_movies_raw)),
+            ]
+            for label, future in futures:
+                dataset_texts, dataset_metadatas = future.result()
+                texts.extend(dataset_texts)
+                metadatas.extend(dataset_metadatas)
+                print(f"✅ Loaded {len(dataset_texts)} {label} documents")
+
+        print(f"📊 Total documents: {len(texts)}")
+
+        return texts, metadatas
+
+    @staticmethod
+    def iter_all_raw(
+        netflix_path: Path,
+        tv_shows_path: Path,
+        imdb_path: Path,
+        chunksize: int = 2048
+    ) -> Iterator[Tuple[List[str], List[Dict]]]:
+        """
+        Stream all datasets as (texts, metadata dicts) chunks.
+
+        Only one chunk of CSV rows is parsed and held at a time, so an upload
+        consuming this iterator needs memory for a few chunks, not the full
+        datasets.
+
+        Args:
+            netflix_path: Path to Netflix CSV
+            tv_shows_path: Path to TV shows CSV
+            imdb_path: Path to IMDB movies CSV
+            chunksize: CSV rows per chunk
+
+        Yields:
+            (page_content strings, metadata dicts) for at most `chunksize` rows
+        """
+        datasets = [
+            (netflix_path, MovieDocumentLoader.NETFLIX_COLUMNS, MovieDocumentLoader._netflix_columns),
+            (tv_shows_path, MovieDocumentLoader.TV_SHOWS_COLUMNS, MovieDocumentLoader._tv_shows_columns),
+            (imdb_path, MovieDocumentLoader.IMDB_MOVIES_COLUMNS, MovieDocumentLoader._imdb_movies_columns),
+        ]
+        for csv_path, usecols, build_columns in datasets:
+            for df in MovieDocumentLoader(csv_path)._iter_csv(usecols, chunksize):
+                yield MovieDocumentLoader._to_raw(*build_columns(df))
+
+    @staticmethod
+    def iter_all_datasets(
+        netflix_path: Path,
+        tv_shows_path: Path,
+        imdb_path: Path,
+        batch_size: int = 100
+    ) -> Iterator[List[Document]]:
+        """
+        Stream all datasets as batches of Documents.
+
+        Same CSV streaming as `iter_all_raw`, for consumers that want
+        Document objects; only one batch is built at a time.
+
+        Args:
+            netflix_path: Path to Netflix CSV
+            tv_shows_path: Path to TV shows CSV
+            imdb_path: Path to IMDB movies CSV
+            batch_size: Documents per batch
+
+        Yields:
+            Lists of at most `batch_size` documents
+        """
+        for texts, metadatas in MovieDocumentLoader.iter_all_raw(
+            netflix_path, tv_shows_path, imdb_path, chunksize=batch_size
+        ):
+            yield [
+                Document(page_content=page_content, metadata=row_metadata)
+                for page_content, row_metadata in zip(texts, metadatas)
+            ]
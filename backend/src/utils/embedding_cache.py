@@ -0,0 +1,166 @@
+"""
+On-disk embedding cache.
+
+Re-running ingestion re-embeds mostly identical documents. Vectors are
+stored in a local SQLite table keyed by a hash of (model, text), as packed
+float32 bytes (1536 dims = 6 KB per vector), so only new or changed
+documents hit the OpenAI API.
+
+`CachedEmbeddings` puts the same cache in front of any LangChain embeddings
+model (e.g. as the `embedding=` of a vector store), so repeated queries skip
+the embeddings call too.
+"""
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.config import EMBEDDING_CACHE_PATH
+
+# Keys per SELECT (stays under SQLite's bound-parameter limit)
+_LOOKUP_BATCH_SIZE = 500
+
+
+def embedding_cache_key(model: str, text: str) -> str:
+    """Cache key for the embedding of `text` under `model`."""
+    return hashlib.blake2b(f"{model}|{text}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Persistent key -> float32 vector store backed by SQLite.
+
+    Thread-safe; one connection is shared behind a lock.
+
+    Args:
+        path: SQLite database file (created with its parent directory if missing)
+    """
+
+    def __init__(self, path: Path = EMBEDDING_CACHE_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """
+        Look up cached vectors.
+
+        Args:
+            keys: Keys from `embedding_cache_key`
+
+        Returns:
+            Mapping of the keys that were found to their vectors
+        """
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), _LOOKUP_BATCH_SIZE):
+                batch = keys[start:start + _LOOKUP_BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch
+                )
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+        return found
+
+    def set_many(self, items: Iterable[Tuple[str, List[float]]]) -> None:
+        """
+        Store vectors (overwriting existing keys).
+
+        Args:
+            items: (key, vector) pairs
+        """
+        rows = [
+            (key, np.asarray(vector, dtype=np.float32).tobytes())
+            for key, vector in items
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                rows
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    LangChain embeddings wrapper that consults an `EmbeddingCache` first.
+
+    Queries are keyed on their normalized form (stripped, lowercased), so
+    "Sci-fi TV series " and "sci-fi tv series" share one vector; document
+    texts are keyed exactly. The async methods run SQLite I/O in a worker
+    thread, off the event loop.
+
+    Args:
+        embeddings: Underlying embeddings model (e.g. OpenAIEmbeddings)
+        model: Model name, part of every cache key
+        cache: Vector store for the cached embeddings
+    """
+
+    def __init__(self, embeddings: Embeddings, model: str, cache: EmbeddingCache = None):
+        self.embeddings = embeddings
+        self.model = model
+        self.cache = cache or EmbeddingCache()
+
+    def _query_key(self, text: str) -> str:
+        return embedding_cache_key(self.model, "query|" + text.strip().lower())
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self._query_key(text)
+        cached = self.cache.get_many([key])
+        if key in cached:
+            return cached[key]
+
+        vector = self.embeddings.embed_query(text)
+        self.cache.set_many([(key, vector)])
+        return vector
+
+    async def aembed_query(self, text: str) -> List[float]:
+        key = self._query_key(text)
+        cached = await asyncio.to_thread(self.cache.get_many, [key])
+        if key in cached:
+            return cached[key]
+
+        vector = await self.embeddings.aembed_query(text)
+        await asyncio.to_thread(self.cache.set_many, [(key, vector)])
+        return vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [embedding_cache_key(self.model, text) for text in texts]
+        vectors = self.cache.get_many(keys)
+
+        missing = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        if missing:
+            fresh = dict(zip(missing, self.embeddings.embed_documents(list(missing.values()))))
+            self.cache.set_many(fresh.items())
+            vectors.update(fresh)
+        return [vectors[key] for key in keys]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [embedding_cache_key(self.model, text) for text in texts]
+        vectors = await asyncio.to_thread(self.cache.get_many, keys)
+
+        missing = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        if missing:
+            fresh_vectors = await self.embeddings.aembed_documents(list(missing.values()))
+            fresh = dict(zip(missing, fresh_vectors))
+            await asyncio.to_thread(self.cache.set_many, list(fresh.items()))
+            vectors.update(fresh)
+        return [vectors[key] for key in keys]
@@ -0,0 +1,65 @@
+"""
+orjson for the Pinecone REST client.
+
+The sync REST client encodes request bodies (upserts of 1536-float vectors)
+and decodes responses with stdlib `json`. orjson is several times faster on
+float lists, so the client's module-level `json` is swapped for an
+orjson-backed stand-in.
+
+Only the REST upload path benefits: queries and the upload pipeline in
+`src.rag.embeddings` use the gRPC index (protobuf, no JSON), and the asyncio
+client has its own serializer. The patch is therefore applied by
+`ingest_imdb_data.py`, which upserts through a REST `Index`, not at import
+of the query modules.
+
+Only the two call sites on the data path are patched; anything unexpected
+(client version without these modules) leaves the client untouched.
+"""
+
+import importlib
+import logging
+from types import SimpleNamespace
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Modules in the pinecone package whose `json` global is replaced
+_PINECONE_JSON_MODULES = (
+    "pinecone.openapi_support.rest_urllib3",  # Request bodies
+    "pinecone.openapi_support.deserializer",  # Response bodies
+)
+
+
+def _dumps(obj, **kwargs) -> str:
+    # Callers join/format the result, so return str like json.dumps does
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+
+
+# orjson.JSONDecodeError subclasses ValueError, which the deserializer catches
+_ORJSON_SHIM = SimpleNamespace(dumps=_dumps, loads=orjson.loads)
+
+
+def patch_pinecone_json() -> bool:
+    """
+    Make the Pinecone client serialize with orjson (idempotent).
+
+    Returns:
+        True if every target module was patched
+    """
+    patched = True
+    for name in _PINECONE_JSON_MODULES:
+        try:
+            module = importlib.import_module(name)
+        except ImportError:
+            patched = False
+            continue
+
+        if getattr(module, "json", None) is None:
+            patched = False
+            continue
+        module.json = _ORJSON_SHIM
+
+    if not patched:
+        logger.debug("Pinecone client layout not recognized; keeping stdlib json")
+    return patched
@@ -0,0 +1,27 @@
+"""
+Shared HTTP connection pools.
+
+Every OpenAI client (chat models and embeddings) is built on these pools,
+so keep-alive connections and TLS sessions are reused across clients
+instead of each client opening its own. HTTP/2 lets concurrent requests
+to the same host share one connection.
+"""
+
+from functools import lru_cache
+
+import httpx
+
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+HTTP_TIMEOUT = httpx.Timeout(30.0)
+
+
+@lru_cache(maxsize=None)
+def get_http_client() -> httpx.Client:
+    """Process-wide pool for sync calls."""
+    return httpx.Client(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT, http2=True)
+
+
+@lru_cache(maxsize=None)
+def get_async_http_client() -> httpx.AsyncClient:
+    """Process-wide pool for async calls."""
+    return httpx.AsyncClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT, http2=True)
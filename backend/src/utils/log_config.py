@@ -0,0 +1,46 @@
+"""
+Logging setup.
+
+Pipeline modules log through `logging.getLogger(__name__)` instead of
+print(). Records are handed to a queue and written to stderr by a
+background listener thread, so request handlers never block on terminal
+or pipe I/O.
+"""
+
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, Union
+
+from src.config import LOG_LEVEL
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(level: Union[int, str] = LOG_LEVEL) -> None:
+    """
+    Route all logging through a queue to a background writer thread.
+
+    Safe to call more than once; later calls only change the level.
+
+    Args:
+        level: Root log level (pipeline step messages are DEBUG)
+    """
+    global _listener
+
+    root = logging.getLogger()
+    root.setLevel(level)
+
+    if _listener is not None:
+        return
+
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    root.handlers = [QueueHandler(log_queue)]
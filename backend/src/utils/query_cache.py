@@ -0,0 +1,106 @@
+"""
+Similarity-search result cache.
+
+Vector store results for a (query, k) pair don't change within a session,
+so repeated queries can skip the embedding call and the Pinecone round trip.
+Entries expire after a TTL (the index can be re-uploaded) and the least
+recently used are evicted first.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+from src.config import QUERY_RESULT_CACHE_SIZE, QUERY_RESULT_CACHE_TTL_SECONDS
+
+
+def normalize_query(query: str) -> str:
+    """Collapse case and whitespace so trivially different queries share an entry."""
+    return " ".join(query.lower().split())
+
+
+class QueryCache:
+    """
+    Thread-safe LRU + TTL cache of similarity-search results.
+
+    Args:
+        max_size: Maximum number of entries before the least recently used is evicted
+        ttl_seconds: Entry lifetime
+    """
+
+    def __init__(
+        self,
+        max_size: int = QUERY_RESULT_CACHE_SIZE,
+        ttl_seconds: float = QUERY_RESULT_CACHE_TTL_SECONDS
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Tuple[str, int, Hashable], Tuple[float, List[Document]]]" = OrderedDict()
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(query: str, k: int, namespace: Hashable) -> Tuple[str, int, Hashable]:
+        return normalize_query(query), k, namespace
+
+    def get(self, query: str, k: int, namespace: Hashable = None) -> Optional[List[Document]]:
+        """
+        Look up cached results.
+
+        Args:
+            query: Search query
+            k: Number of results requested
+            namespace: Extra key part for callers whose results differ per query+k
+
+        Returns:
+            Copy of the cached document list, or None on a miss
+        """
+        key = self._key(query, k, namespace)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            timestamp, docs = entry
+            if time.time() - timestamp > self.ttl_seconds:
+                del self._data[key]
+                self.evictions += 1
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return list(docs)
+
+    def put(self, query: str, k: int, docs: List[Document], namespace: Hashable = None) -> None:
+        """
+        Cache results for (query, k).
+
+        Args:
+            query: Search query
+            k: Number of results requested
+            docs: Retrieved documents
+            namespace: Extra key part (see `get`)
+        """
+        key = self._key(query, k, namespace)
+        with self._lock:
+            self._data[key] = (time.time(), list(docs))
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
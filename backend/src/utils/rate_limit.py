@@ -0,0 +1,67 @@
+"""
+Rate limiting for async OpenAI calls.
+
+Fan-out paths (compare endpoint, ingestion) can fire many LLM/embedding
+requests at once. Every async OpenAI call goes through `throttled`, which:
+1. Caps concurrent requests with a shared semaphore
+2. Retries 429s with exponential backoff (honoring Retry-After)
+"""
+
+import asyncio
+import random
+from typing import Awaitable, Callable, TypeVar
+
+from openai import RateLimitError
+
+from src.config import OPENAI_MAX_CONCURRENCY, OPENAI_RATE_LIMIT_RETRIES
+
+T = TypeVar("T")
+
+# Shared by every async OpenAI call in the process
+OPENAI_SEMAPHORE = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+
+
+def _retry_delay(error: RateLimitError, attempt: int) -> float:
+    """Seconds to wait before the next attempt."""
+    retry_after = error.response.headers.get("retry-after") if error.response is not None else None
+    try:
+        return float(retry_after)
+    except (TypeError, ValueError):
+        return min(2 ** attempt, 30) + random.random()
+
+
+async def with_backoff(
+    call: Callable[[], Awaitable[T]],
+    max_retries: int = OPENAI_RATE_LIMIT_RETRIES
+) -> T:
+    """
+    Await `call()`, retrying on RateLimitError.
+
+    Args:
+        call: Zero-argument function returning a fresh awaitable per attempt
+        max_retries: Retries before the RateLimitError is re-raised
+
+    Returns:
+        Result of the first successful attempt
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return await call()
+        except RateLimitError as e:
+            if attempt == max_retries:
+                raise
+            await asyncio.sleep(_retry_delay(e, attempt))
+
+
+async def throttled(
+    call: Callable[[], Awaitable[T]],
+    max_retries: int = OPENAI_RATE_LIMIT_RETRIES
+) -> T:
+    """
+    Await `call()` under the shared OpenAI concurrency limit, with backoff.
+
+    Example:
+        answer = await throttled(lambda: chain.ainvoke({"query": query}))
+    """
+    async with OPENAI_SEMAPHORE:
+        return await with_backoff(call, max_retries)
@@ -2,16 +2,22 @@
 Test Basic RAG Pipeline.
 """
 
-from src.rag.basic_rag import BasicRAG
-import json
+import asyncio
+import sys
 
+from src.rag.factory import get_basic_rag
+from src.utils.log_config import setup_logging
 
-def main():
+# Banner rules (built once)
+SEP80 = "=" * 80
+
+
+async def main():
     print("🎬 Testing Basic RAG Pipeline\n")
-    print("=" * 80)
+    print(SEP80)
 
     # Initialize RAG
-    rag = BasicRAG()
+    rag = get_basic_rag()
 
     # Test queries
     test_queries = [
@@ -21,29 +27,34 @@ def main():
         "Tell me about movies with high ratings"
     ]
 
-    for i, question in enumerate(test_queries, 1):
-        print(f"\n{'='*80}")
-        print(f"Query {i}: {question}")
-        print('='*80)
-
-        # Get answer
-        result = rag.query(question, k=3)
-
-        # Display results
-        print(f"\n💬 Answer:")
-        print(result['answer'])
-
-        print(f"\n📚 Sources ({result['num_sources']}):")
-        for j, source in enumerate(result['sources'], 1):
-            print(f"  {j}. {source['title']}")
-            print(f"     Source: {source['source']} | Genre: {source['genre']} | Rating: {source['rating']}")
-
-        print("\n")
-
-    print("=" * 80)
+    # Run all queries concurrently (wall time ≈ slowest query), then print in order
+    results = await asyncio.gather(*[rag.aquery(q, k=3) for q in test_queries])
+
+    for i, (question, result) in enumerate(zip(test_queries, results), 1):
+        # Display results (each query's block is built, then written once)
+        sources = "\n".join(
+            f"  {j}. {s.title}\n     Source: {s.source} | Genre: {s.genre} | Rating: {s.rating}"
+            for j, s in enumerate(result['sources'], 1)
+        )
+        lines = [
+            "\n" + SEP80,
+            f"Query {i}: {question}",
+            SEP80,
+            "\n💬 Answer:",
+            result['answer'],
+            f"\n📚 Sources ({result['num_sources']}):",
+        ]
+        if sources:
+            lines.append(sources)
+        lines.append("\n")
+
+        sys.stdout.write("\n".join(lines) + "\n")
+
+    print(SEP80)
     print("✅ Basic RAG test complete!")
-    print("=" * 80)
+    print(SEP80)
 
 
 if __name__ == "__main__":
-    main()
+    setup_logging("DEBUG")  # Show pipeline steps
+    asyncio.run(main())
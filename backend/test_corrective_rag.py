@@ -6,39 +6,55 @@ Test Cases:
 2. Irrelevant query (should trigger web search)
 """
 
-from src.rag.corrective_rag import CorrectiveRAG
+import sys
 
+from src.rag.corrective_rag import CorrectiveResult
+from src.rag.factory import get_corrective_rag
+from src.utils.log_config import setup_logging
 
-def print_result(result):
-    """Pretty print result."""
-    print(f"\n💬 ANSWER:")
-    print(result['answer'])
+# Banner rules (built once)
+SEP80 = "=" * 80
 
-    print(f"\n📊 METADATA:")
-    metadata = result['metadata']
-    print(f"   Strategy: {metadata['strategy']}")
-    print(f"   Relevance Score: {metadata['relevance_score']}/10")
-    print(f"   Explanation: {metadata['score_explanation']}")
-    print(f"   Used Web Search: {'YES' if metadata['used_web_search'] else 'NO'}")
-    print(f"   Answer Grounded: {'✅ YES' if metadata['is_grounded'] else '❌ NO'}")
-    print(f"   Verification: {metadata['verification_feedback']}")
+_YES_NO = {True: 'YES', False: 'NO'}
+_GROUNDED = {True: '✅ YES', False: '❌ NO'}
 
-    print(f"\n📚 SOURCES ({metadata['num_sources']}):")
-    for i, source in enumerate(result['sources'], 1):
-        print(f"   {i}. {source['title']} ({source['source']})")
+
+def print_result(r: CorrectiveResult):
+    """Pretty print result (built as one string, written once)."""
+    sources = "\n".join(
+        f"   {i}. {s.title} ({s.source})"
+        for i, s in enumerate(r.sources, 1)
+    )
+
+    lines = [
+        "\n💬 ANSWER:",
+        r.answer,
+        "\n📊 METADATA:",
+        f"   Strategy: {r.strategy}",
+        f"   Relevance Score: {r.relevance_score}/10",
+        f"   Explanation: {r.score_explanation}",
+        f"   Used Web Search: {_YES_NO[bool(r.used_web_search)]}",
+        f"   Answer Grounded: {_GROUNDED[bool(r.is_grounded)]}",
+        f"   Verification: {r.verification_feedback}",
+        f"\n📚 SOURCES ({r.num_sources}):",
+    ]
+    if sources:
+        lines.append(sources)
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main():
     print("🎬 Testing Corrective RAG Pipeline\n")
-    print("="*80)
+    print(SEP80)
 
     # Initialize Corrective RAG
-    rag = CorrectiveRAG()
+    rag = get_corrective_rag()
 
     # Test Case 1: Relevant query (in our database)
-    print("\n" + "="*80)
+    print("\n" + SEP80)
     print("TEST CASE 1: Relevant Query (Should Use Vector DB)")
-    print("="*80)
+    print(SEP80)
 
     question1 = "What are some action movies with high ratings?"
     result1 = rag.query_corrective(
@@ -49,12 +65,12 @@ def main():
         enable_verification=True
     )
 
-    print_result(result1)
+    print_result(rag.to_result(result1))
 
     # Test Case 2: Irrelevant query (NOT in our database)
-    print("\n\n" + "="*80)
+    print("\n\n" + SEP80)
     print("TEST CASE 2: Irrelevant Query (Should Trigger Web Search)")
-    print("="*80)
+    print(SEP80)
 
     question2 = "Who won the Oscar for Best Picture in 2024?"
     result2 = rag.query_corrective(
@@ -65,12 +81,13 @@ def main():
         enable_verification=True
     )
 
-    print_result(result2)
+    print_result(rag.to_result(result2))
 
-    print("\n\n" + "="*80)
+    print("\n\n" + SEP80)
     print("✅ Corrective RAG test complete!")
-    print("="*80)
+    print(SEP80)
 
 
 if __name__ == "__main__":
+    setup_logging("DEBUG")  # Show pipeline steps
     main()
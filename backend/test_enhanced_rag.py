@@ -3,48 +3,63 @@ Test Enhanced RAG with different query strategies.
 Compare: Basic vs HyDE vs Multi-Query vs Expansion
 """
 
-from src.rag.enhanced_rag import EnhancedRAG
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from src.rag.factory import get_enhanced_rag
+from src.utils.log_config import setup_logging
 
-def test_strategy(rag, question, strategy):
-    """Test a single strategy."""
-    print("\n" + "="*80)
-    print(f"STRATEGY: {strategy.upper()}")
-    print("="*80)
+# Banner rules (built once)
+SEP80 = "=" * 80
 
-    result = rag.query_enhanced(question, strategy=strategy, k=3)
 
-    print(f"\n💬 Answer:")
-    print(result['answer'])
+def print_result(strategy, result):
+    """Print one strategy's result (one write, so blocks never interleave)."""
+    sources = "\n".join(
+        f"  {i}. {s.title}\n     {s.genre} | {s.rating}"
+        for i, s in enumerate(result['sources'], 1)
+    )
+    lines = [
+        "\n" + SEP80,
+        f"STRATEGY: {strategy.upper()}",
+        SEP80,
+        "\n💬 Answer:",
+        result['answer'],
+        f"\n📚 Sources ({result['num_sources']}):",
+    ]
+    if sources:
+        lines.append(sources)
 
-    print(f"\n📚 Sources ({result['num_sources']}):")
-    for i, source in enumerate(result['sources'], 1):
-        print(f"  {i}. {source['title']}")
-        print(f"     {source['genre']} | {source['rating']}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main():
     print("🎬 Testing Enhanced RAG Strategies\n")
 
     # Initialize enhanced RAG
-    rag = EnhancedRAG()
+    rag = get_enhanced_rag()
 
     # Test query
     question = "funny Indian shows"
 
     print(f"Test Question: '{question}'")
-    print("\n" + "="*80)
+    print("\n" + SEP80)
 
     # Test all strategies
     strategies = ["basic", "hyde", "multi_query", "expansion"]
 
-    for strategy in strategies:
-        test_strategy(rag, question, strategy)
+    # Strategies are independent network-bound pipelines (EnhancedRAG's caches
+    # are locked and its clients share one httpx pool), so run them side by side
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        futures = {ex.submit(rag.query_enhanced, question, strategy=s, k=3): s for s in strategies}
+        for future in as_completed(futures):
+            print_result(futures[future], future.result())
 
-    print("\n" + "="*80)
+    print("\n" + SEP80)
     print("✅ Enhanced RAG test complete!")
-    print("="*80)
+    print(SEP80)
 
 
 if __name__ == "__main__":
+    setup_logging("DEBUG")  # Show pipeline steps
     main()
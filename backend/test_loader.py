@@ -5,6 +5,9 @@ Test script to verify document loader works correctly.
 from src.config import NETFLIX_CSV, TV_SHOWS_CSV, IMDB_MOVIES_CSV
 from src.utils.document_loader import MovieDocumentLoader
 
+# Banner rules (built once)
+SEP60 = "=" * 60
+
 
 def main():
     print("🚀 Testing Document Loader...\n")
@@ -17,11 +20,11 @@ def main():
     )
 
     print(f"\n📄 Sample Document:")
-    print("=" * 60)
+    print(SEP60)
     print(documents[0].page_content)
     print("\n🏷️  Metadata:")
     print(documents[0].metadata)
-    print("=" * 60)
+    print(SEP60)
 
     print(f"\n✅ Document loader test passed!")
 
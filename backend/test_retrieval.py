@@ -2,22 +2,48 @@
 Test semantic search retrieval from Pinecone.
 """
 
+import sys
+
 from langchain_openai import OpenAIEmbeddings
 from langchain_pinecone import PineconeVectorStore
-from src.config import OPENAI_API_KEY, PINECONE_INDEX_NAME, EMBEDDING_MODEL
+from src.config import OPENAI_API_KEY, EMBEDDING_MODEL
+from src.rag.vector_store import batch_similarity_search, get_grpc_index
+from src.utils.embedding_cache import CachedEmbeddings
+from src.utils.query_cache import QueryCache
+
+# Banner rules (built once)
+SEP60 = "=" * 60
+RULE60 = "-" * 60
+
+_query_cache = QueryCache()
+
+
+def _cached_search(vector_store: PineconeVectorStore, queries, k: int):
+    """Batched similarity search; queries already in the session's QueryCache are skipped."""
+    results = {query: _query_cache.get(query, k) for query in queries}
+    missing = [query for query, docs in results.items() if docs is None]
+
+    for query, docs in zip(missing, batch_similarity_search(vector_store, missing, k)):
+        _query_cache.put(query, k, docs)
+        results[query] = docs
+    return [results[query] for query in queries]
 
 
 def main():
     print("🔍 Testing Semantic Search...\n")
 
-    # Initialize embeddings and vector store
-    embeddings = OpenAIEmbeddings(
-        model=EMBEDDING_MODEL,
-        openai_api_key=OPENAI_API_KEY
+    # Initialize embeddings and vector store (query vectors are cached on disk,
+    # so re-runs only pay for the Pinecone searches)
+    embeddings = CachedEmbeddings(
+        OpenAIEmbeddings(
+            model=EMBEDDING_MODEL,
+            openai_api_key=OPENAI_API_KEY
+        ),
+        model=EMBEDDING_MODEL
     )
 
     vector_store = PineconeVectorStore(
-        index_name=PINECONE_INDEX_NAME,
+        index=get_grpc_index(),
         embedding=embeddings
     )
 
@@ -28,20 +54,21 @@ def main():
         "sci-fi TV series"
     ]
 
-    for query in queries:
-        print(f"📝 Query: '{query}'")
-        print("-" * 60)
-
-        # Semantic search
-        results = vector_store.similarity_search(query, k=3)
+    # Semantic search (one embedding call for all queries, Pinecone lookups in parallel)
+    all_results = _cached_search(vector_store, queries, k=3)
 
+    for query, results in zip(queries, all_results):
+        lines = [f"📝 Query: '{query}'", RULE60]
         for i, doc in enumerate(results, 1):
-            print(f"\n{i}. {doc.metadata.get('title', 'N/A')}")
-            print(f"   Source: {doc.metadata.get('source', 'N/A')}")
-            print(f"   Genre: {doc.metadata.get('genre', 'N/A')}")
-            print(f"   Rating: {doc.metadata.get('rating', 'N/A')}")
+            lines.append(f"\n{i}. {doc.metadata.get('title', 'N/A')}")
+            lines.append(f"   Source: {doc.metadata.get('source', 'N/A')}")
+            lines.append(f"   Genre: {doc.metadata.get('genre', 'N/A')}")
+            lines.append(f"   Rating: {doc.metadata.get('rating', 'N/A')}")
+        lines.append("\n" + SEP60 + "\n")
+
+        sys.stdout.write("\n".join(lines) + "\n")
 
-        print("\n" + "=" * 60 + "\n")
+    print(f"Query cache: {_query_cache.hits} hits, {_query_cache.misses} misses")
 
 
 if __name__ == "__main__":
@@ -6,35 +6,71 @@ This will:
 2. Generate embeddings via OpenAI
 3. Upload to Pinecone
 4. Cost: ~$0.03
+
+Re-runs are skipped when the index already holds an upload of the same
+CSV files (set FORCE_REUPLOAD=1 to upload anyway). Vector ids are derived
+from each row, so a re-upload overwrites vectors instead of duplicating them.
 """
 
+import hashlib
+import os
+
 from src.config import NETFLIX_CSV, TV_SHOWS_CSV, IMDB_MOVIES_CSV
 from src.utils.document_loader import MovieDocumentLoader
 from src.rag.embeddings import DocumentEmbedder
 from src.rag.vector_store import PineconeVectorStore
 
+# Documents in a complete upload of the three CSVs (used when no fingerprint marker exists)
+EXPECTED_DOCUMENT_COUNT = 15_446
+
+
+def dataset_fingerprint(*paths) -> str:
+    """SHA-256 over the CSV files' contents (any edit forces a re-upload)."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
 
 def main():
     print("🎬 Movie RAG - Document Upload Pipeline\n")
     print("=" * 60)
 
+    # Step 0: Skip if these exact CSVs are already uploaded
+    vs = PineconeVectorStore()
+    fingerprint = dataset_fingerprint(NETFLIX_CSV, TV_SHOWS_CSV, IMDB_MOVIES_CSV)
+    uploaded_fingerprint, document_count = vs.get_upload_marker()
+    if uploaded_fingerprint is None:
+        # Index uploaded before markers existed: trust a complete vector count
+        already_uploaded = document_count >= EXPECTED_DOCUMENT_COUNT
+    else:
+        already_uploaded = uploaded_fingerprint == fingerprint and document_count > 0
+
+    if already_uploaded and os.environ.get("FORCE_REUPLOAD") != "1":
+        print(f"\n✅ Already uploaded ({document_count} vectors), skipping. Set FORCE_REUPLOAD=1 to re-upload.")
+        return
+
     # Step 1: Load documents
     print("\n📚 Step 1: Loading documents...")
-    documents = MovieDocumentLoader.load_all_datasets(
+    # Plain (text, metadata) chunks, read lazily - only a few chunks are
+    # ever in memory, and the upload never needs Document objects
+    chunks = MovieDocumentLoader.iter_all_raw(
         netflix_path=NETFLIX_CSV,
         tv_shows_path=TV_SHOWS_CSV,
         imdb_path=IMDB_MOVIES_CSV
     )
 
-    # Step 2: Embed and upload
+    # Step 2: Embed and upload (overlaps with reading the next chunks)
     print("\n🔮 Step 2: Generating embeddings and uploading to Pinecone...")
     embedder = DocumentEmbedder()
-    vector_store = embedder.embed_and_upload(documents, batch_size=100)
+    vector_store = embedder.embed_and_upload_stream(chunks)
 
     # Step 3: Verify upload
     print("\n📊 Step 3: Verifying upload...")
-    vs = PineconeVectorStore()
     vs.get_index_stats()
+    vs.set_upload_marker(fingerprint)
 
     print("\n" + "=" * 60)
     print("✅ Upload complete! Your RAG system is ready!")